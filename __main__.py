@@ -4,6 +4,7 @@ Main entry point for Tool4S application.
 
 import sys
 import logging
+import multiprocessing
 from PyQt5.QtWidgets import QApplication
 from gui.main_window import MainWindow
 from utils.config import config
@@ -31,4 +32,6 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Lets worker processes (e.g. PSD calculation) start in the frozen executable
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
@@ -10,6 +10,8 @@ from PyQt5.QtGui import QStandardItemModel, QStandardItem
 from PyQt5.QtCore import QAbstractItemModel
 from PyQt5.QtCore import Qt, QThread, QObject, pyqtSignal, QTimer
 import os
+import threading
+import time
 from pathlib import Path
 import logging
 import json
@@ -24,9 +26,13 @@ class BaseToolWorker(QObject):
     
     progress = pyqtSignal(int)
     finished = pyqtSignal()
-    error = pyqtSignal(str)
+    error = pyqtSignal(list)  # Batched error messages
     output_folder_created = pyqtSignal(str)  # New signal for output folder creation
     status_update = pyqtSignal(str)  # New signal for status updates
+    
+    ERROR_FLUSH_INTERVAL = 0.2  # Seconds between batched error emits
+    PROGRESS_INTERVAL = 0.05  # Seconds between progress emits (20 Hz)
+    
     def __init__(self):
         """Initialize worker."""
         super().__init__()
@@ -39,6 +45,10 @@ class BaseToolWorker(QObject):
         self._is_cancelled = False
         self.trace_num = 1  # Default to single component
         self.components = []  # Component(channel) names from data.json or file's name
+        self._pending_errors = []
+        self._errors_lock = threading.Lock()
+        self._last_error_flush = 0.0
+        self._last_progress_emit = 0.0
         
     def run(self):
         """Process all files in the list. 
@@ -62,16 +72,18 @@ class BaseToolWorker(QObject):
                     if self._is_cancelled:  # Check after each file
                         break
                     progress = int((i + 1) / total_files * 100)
-                    self.progress.emit(progress)
+                    self.report_progress(progress)
                 except Exception as e:
                     logger.error(f"Error processing file {filename}: {e}")
-                    self.error.emit(str(e))
+                    self.report_error(str(e))
                     
             self.progress.emit(100)
+            self.flush_errors()
             self.finished.emit()
         except Exception as e:
             logger.error(f"Error in processing: {e}")
-            self.error.emit(str(e))
+            self.report_error(str(e))
+            self.flush_errors()
             self.finished.emit()
             
     def process_file(self, filename):
@@ -87,6 +99,43 @@ class BaseToolWorker(QObject):
     def cancel(self):
         """Cancel the processing."""
         self._is_cancelled = True
+        
+    def report_error(self, message: str):
+        """Queue an error message for the dialog.
+        
+        Queued messages are emitted together at most every
+        ERROR_FLUSH_INTERVAL seconds; call flush_errors() before finishing.
+        
+        Args:
+            message: Error message to report
+        """
+        with self._errors_lock:
+            self._pending_errors.append(message)
+            now = time.monotonic()
+            if now - self._last_error_flush < self.ERROR_FLUSH_INTERVAL:
+                return
+            self._last_error_flush = now
+            errors, self._pending_errors = self._pending_errors, []
+        self.error.emit(errors)
+        
+    def flush_errors(self):
+        """Emit any queued error messages."""
+        with self._errors_lock:
+            errors, self._pending_errors = self._pending_errors, []
+        if errors:
+            self.error.emit(errors)
+            
+    def report_progress(self, value: int):
+        """Emit progress, at most once every PROGRESS_INTERVAL seconds.
+        
+        Args:
+            value: Progress percentage; 100 is always emitted
+        """
+        now = time.monotonic()
+        if value < 100 and now - self._last_progress_emit < self.PROGRESS_INTERVAL:
+            return
+        self._last_progress_emit = now
+        self.progress.emit(value)
 
     def create_output_directory(self, output_dir):
         """Create output directory and emit signal.
@@ -521,6 +570,10 @@ class BaseToolDialog(QDialog):
         """Show error message from worker thread."""
         QMessageBox.critical(self, "Error", message)
         
+    def _show_errors(self, messages):
+        """Show a batch of error messages from worker thread in one message box."""
+        self._show_error("\n".join(messages))
+        
     def load_data_info(self):
         """Load data information from config."""
         try:
@@ -6,8 +6,9 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                            QPushButton, QProgressBar, QMessageBox,
                            QTextEdit, QDoubleSpinBox, QListWidget,
                            QFileDialog, QGroupBox, QCheckBox, QSplitter,
-                           QWidget, QTreeWidget, QTreeWidgetItem)
-from PyQt5.QtCore import Qt, QThread, QObject, pyqtSignal
+                           QWidget, QTreeView)
+from PyQt5.QtCore import (Qt, QThread, QObject, pyqtSignal,
+                          QAbstractItemModel, QModelIndex, QSignalBlocker)
 import os
 from pathlib import Path
 import logging
@@ -25,6 +26,235 @@ from utils.constants import DEFAULT_OUTPUT_FOLDER
 
 logger = logging.getLogger(__name__)
 
+# Item data role holding the path of a tree item relative to the output folder
+ITEM_PATH_ROLE = Qt.UserRole + 1
+
+
+class StationNode:
+    """Node of the station tree, one per folder below the output directory."""
+    
+    __slots__ = ('name', 'parent', 'children', 'row', 'path',
+                 'leaf_count', 'checked_count')
+    
+    def __init__(self, name: str, parent=None, row: int = 0):
+        self.name = name
+        self.parent = parent
+        self.children = []
+        self.row = row
+        self.path = ""
+        self.leaf_count = 0
+        self.checked_count = 0
+        
+    def is_leaf(self) -> bool:
+        """Whether this node is an end node (component)."""
+        return not self.children
+        
+    def check_state(self):
+        """Derive the check state from the number of checked leaves below."""
+        if self.checked_count == 0:
+            return Qt.Unchecked
+        if self.checked_count == self.leaf_count:
+            return Qt.Checked
+        return Qt.PartiallyChecked
+
+
+class StationTreeModel(QAbstractItemModel):
+    """Checkable tree model of the station and component folders.
+    
+    Every node keeps the number of checked leaves below it, so check state
+    is derived in constant time and a toggle only walks the affected subtree
+    and the path up to the root.
+    """
+    
+    # Emitted after a check state change made through the view
+    checkStateChanged = pyqtSignal()
+    
+    def __init__(self, parent=None):
+        """Initialize model."""
+        super().__init__(parent)
+        self._root = StationNode("")
+        self.checked_leaves = {}  # Checked end nodes, used as an ordered set
+        
+        # Number of leaves and of checked leaves per component name
+        self.component_total = {}
+        self.component_checked = {}
+        
+    def set_structure(self, structure: dict):
+        """Rebuild the model from a nested folder structure dictionary."""
+        self.beginResetModel()
+        self._root = StationNode("")
+        self.checked_leaves = {}  # Checked end nodes, used as an ordered set
+        self._build_nodes(structure, self._root)
+        
+        self.component_total = {}
+        for leaf in self.leaves():
+            self.component_total[leaf.name] = self.component_total.get(leaf.name, 0) + 1
+        self.component_checked = dict.fromkeys(self.component_total, 0)
+        self.endResetModel()
+        
+    def _build_nodes(self, structure: dict, parent: StationNode):
+        """Create nodes for a folder structure dictionary recursively."""
+        for folder_name, subfolders in structure.items():
+            node = StationNode(folder_name, parent, len(parent.children))
+            parent.children.append(node)
+            # Inherit the parent path instead of walking back to the root
+            node.path = os.path.join(parent.path, folder_name) if parent.path else folder_name
+            self._build_nodes(subfolders, node)
+            node.leaf_count = sum(child.leaf_count for child in node.children) or 1
+            
+    def leaves(self):
+        """Iterate over all end nodes (components) in tree order."""
+        stack = list(reversed(self._root.children))
+        while stack:
+            node = stack.pop()
+            if node.is_leaf():
+                yield node
+            else:
+                stack.extend(reversed(node.children))
+                
+    def index(self, row, column, parent=QModelIndex()):
+        """Get the index of a child of parent."""
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        node = parent.internalPointer() if parent.isValid() else self._root
+        return self.createIndex(row, column, node.children[row])
+        
+    def parent(self, index):
+        """Get the index of the parent of index."""
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer().parent
+        if node is None or node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+        
+    def rowCount(self, parent=QModelIndex()):
+        """Get the number of children of parent."""
+        if parent.column() > 0:
+            return 0
+        node = parent.internalPointer() if parent.isValid() else self._root
+        return len(node.children)
+        
+    def columnCount(self, parent=QModelIndex()):
+        """Get the number of columns."""
+        return 1
+        
+    def flags(self, index):
+        """Get item flags."""
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+        
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Get header data."""
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section == 0:
+            return "Stations and Components"
+        return None
+        
+    def data(self, index, role=Qt.DisplayRole):
+        """Get data for an index."""
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.DisplayRole:
+            return node.name
+        if role == Qt.CheckStateRole:
+            return node.check_state()
+        if role == ITEM_PATH_ROLE:
+            return node.path
+        return None
+        
+    def setData(self, index, value, role=Qt.EditRole):
+        """Set the check state of an index from the view."""
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+        self.set_checked(index.internalPointer(), value == Qt.Checked)
+        self.checkStateChanged.emit()
+        return True
+        
+    def set_checked(self, node: StationNode, checked: bool):
+        """Check or uncheck a node together with its whole subtree."""
+        delta = (node.leaf_count if checked else 0) - node.checked_count
+        if delta == 0:
+            return
+            
+        # Update the subtree, notifying the view once per row range
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            target = current.leaf_count if checked else 0
+            if current.checked_count == target:
+                continue  # Subtree already in the requested state
+            if current.is_leaf():
+                self._mark_leaf(current, checked)
+            else:
+                self._emit_children_changed(current)
+                stack.extend(current.children)
+            current.checked_count = target
+                
+        # Propagate the change to the ancestors
+        self._emit_node_changed(node)
+        current = node.parent
+        while current is not self._root:
+            old_state = current.check_state()
+            current.checked_count += delta
+            if current.check_state() != old_state:
+                self._emit_node_changed(current)
+            current = current.parent
+            
+    def set_leaves_checked(self, leaves, checked: bool):
+        """Check or uncheck a batch of leaves, notifying views once per row range."""
+        # Parents of the changed leaves and all their ancestors, in order of discovery
+        leaf_parents = {}
+        ancestors = {}
+        for leaf in leaves:
+            delta = (1 if checked else 0) - leaf.checked_count
+            if delta == 0:
+                continue
+            leaf.checked_count += delta
+            self._mark_leaf(leaf, checked)
+            leaf_parents[leaf.parent] = None
+            
+            current = leaf.parent
+            while current is not self._root:
+                current.checked_count += delta
+                ancestors[current] = None
+                current = current.parent
+                
+        # One ranged notification per parent covers its changed leaves
+        for parent in leaf_parents:
+            self._emit_children_changed(parent)
+        for node in ancestors:
+            self._emit_node_changed(node)
+            
+    def _mark_leaf(self, leaf: StationNode, checked: bool):
+        """Record a leaf whose check state is flipping in the checked sets and counters."""
+        if checked:
+            self.checked_leaves[leaf] = None
+            self.component_checked[leaf.name] += 1
+        else:
+            self.checked_leaves.pop(leaf, None)
+            self.component_checked[leaf.name] -= 1
+            
+    def set_all_checked(self, checked: bool):
+        """Check or uncheck every node in the tree."""
+        for node in self._root.children:
+            self.set_checked(node, checked)
+            
+    def _emit_node_changed(self, node: StationNode):
+        """Notify views that the check state of a node changed."""
+        index = self.createIndex(node.row, 0, node)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        
+    def _emit_children_changed(self, node: StationNode):
+        """Notify views that the check state of all children of a node changed."""
+        self.dataChanged.emit(
+            self.createIndex(0, 0, node.children[0]),
+            self.createIndex(len(node.children) - 1, 0, node.children[-1]),
+            [Qt.CheckStateRole]
+        )
+
+
 class CreateFileWorker(QObject):
     """Worker for creating files with overlapping in a separate thread."""
     
@@ -40,6 +270,7 @@ class CreateFileWorker(QObject):
         self.overlap_percent = 50.0  # Changed default to 50%
         self.file_length_hours = 1.0  # Default 1 hour
         self.max_zero_padded_percent = 50.0  # Default max zero-padded percentage
+        self._is_cancelled = False
         
         # Initialize plugin manager
         self.plugin_manager = PluginManager()
@@ -58,6 +289,10 @@ class CreateFileWorker(QObject):
             
             # Process each checked component directory
             for i, component_path in enumerate(self.checked_paths):
+                if self._is_cancelled:
+                    logger.info("Processing cancelled")
+                    break
+                    
                 try:
                     # Get station and component from path
                     path_parts = Path(component_path).parts
@@ -99,6 +334,10 @@ class CreateFileWorker(QObject):
         self.progress.emit(100)
         self.finished.emit()
         
+    def cancel(self):
+        """Cancel the processing."""
+        self._is_cancelled = True
+        
     def _process_component_files(self, component_dir: str, files: list, sta: str, nez: str):
         """Process files in a component directory."""
         try:
@@ -183,6 +422,10 @@ class CreateFileWorker(QObject):
             # Process each created file
             total_created_files = len(created_files)
             for i, created_file in enumerate(created_files):
+                if self._is_cancelled:
+                    logger.info("Processing cancelled")
+                    break
+                    
                 # Check if file already exists
                 out_file = os.path.join(component_dir, created_file['name'])
                 if os.path.exists(out_file):
@@ -364,11 +607,11 @@ class CreateFileDialog(QDialog):
         station_group = QGroupBox("Stations and Components")
         station_layout = QVBoxLayout()
         
-        # Station tree widget
-        self.station_tree = QTreeWidget()
-        self.station_tree.setHeaderLabels(["Stations and Components"])
-        self.station_tree.setColumnCount(1)
-        self.station_tree.itemChanged.connect(self._on_tree_item_changed)
+        # Station tree view
+        self.station_model = StationTreeModel(self)
+        self.station_model.checkStateChanged.connect(self._on_tree_check_state_changed)
+        self.station_tree = QTreeView()
+        self.station_tree.setModel(self.station_model)
         
         # Component selection checkboxes
         self.component_group = QGroupBox("Select Component for All Stations")
@@ -487,9 +730,6 @@ class CreateFileDialog(QDialog):
                 return
             self.output_dir=output_dir
 
-            # Clear the tree widget
-            self.station_tree.clear()
-            
             # Create a dictionary to store the folder structure
             folder_structure = {}
             
@@ -520,8 +760,19 @@ class CreateFileDialog(QDialog):
             # Dictionary to track end nodes (components)
             self.end_nodes = {}
             
-            # Build the tree widget from the folder structure
-            self._build_tree_from_structure(folder_structure, None)
+            # Suspend repaints and sorting while the tree is populated and expanded
+            sorting_enabled = self.station_tree.isSortingEnabled()
+            self.station_tree.setUpdatesEnabled(False)
+            self.station_tree.setSortingEnabled(False)
+            try:
+                # Build the tree model from the folder structure
+                self.station_model.set_structure(folder_structure)
+                
+                # Expand all items in a single pass
+                self.station_tree.expandAll()
+            finally:
+                self.station_tree.setSortingEnabled(sorting_enabled)
+                self.station_tree.setUpdatesEnabled(True)
             
             # Identify end nodes (leaf nodes) as components
             self._identify_end_nodes()
@@ -529,64 +780,20 @@ class CreateFileDialog(QDialog):
             # Create component checkboxes based on end nodes
             self._create_component_checkboxes()
             
-            # Expand all items
-            self.station_tree.expandAll()
-            
         except Exception as e:
             logger.error(f"Error scanning stations: {e}")
             QMessageBox.critical(self, "Error", f"Error scanning stations: {str(e)}")
     
-    def _build_tree_from_structure(self, structure, parent_item):
-        """Build tree widget items from folder structure dictionary."""
-        for folder_name, subfolders in structure.items():
-            # Create tree item
-            item = QTreeWidgetItem()
-            item.setText(0, folder_name)
-            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
-            item.setCheckState(0, Qt.Unchecked)
-            
-            # Add to tree
-            if parent_item is None:
-                self.station_tree.addTopLevelItem(item)
-            else:
-                parent_item.addChild(item)
-            
-            # Process subfolders recursively
-            self._build_tree_from_structure(subfolders, item)
-    
-    def _get_item_path(self, item):
-        """Get the full path of an item in the tree."""
-        path_parts = []
-        current = item
-        
-        while current:
-            path_parts.insert(0, current.text(0))
-            current = current.parent()
-            
-        return os.path.join(*path_parts) if path_parts else ""
-    
     def _identify_end_nodes(self):
         """Identify end nodes (leaf nodes) in the tree as components."""
         # Clear end nodes dictionary
         self.end_nodes = {}
         
-        # Function to recursively find leaf nodes
-        def find_leaf_nodes(item):
-            if item.childCount() == 0:
-                # This is a leaf node (end node)
-                component = item.text(0)
-                if component not in self.end_nodes:
-                    self.end_nodes[component] = []
-                self.end_nodes[component].append(item)
-            else:
-                # Process children
-                for i in range(item.childCount()):
-                    find_leaf_nodes(item.child(i))
-        
-        # Process all top-level items
-        root = self.station_tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            find_leaf_nodes(root.child(i))
+        for node in self.station_model.leaves():
+            # Group leaf nodes (end nodes) by component name
+            if node.name not in self.end_nodes:
+                self.end_nodes[node.name] = []
+            self.end_nodes[node.name].append(node)
     
     def _create_component_checkboxes(self):
         """Create checkboxes for each unique component."""
@@ -620,169 +827,61 @@ class CreateFileDialog(QDialog):
         for comp, checkbox in self.component_checkboxes.items():
             count = component_counts.get(comp, 0)
             
-            # Block signals temporarily
-            checkbox.blockSignals(True)
-            
-            # Update label and enabled state
-            checkbox.setText(f"{comp} ({count})")
-            checkbox.setEnabled(count > 0)
-            
-            # Unblock signals
-            checkbox.blockSignals(False)
+            # Update label and enabled state with signals blocked
+            with QSignalBlocker(checkbox):
+                checkbox.setText(f"{comp} ({count})")
+                checkbox.setEnabled(count > 0)
     
     def _select_all_components(self):
         """Select all components."""
-        # Get all top-level items
-        root = self.station_tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            item = root.child(i)
-            item.setCheckState(0, Qt.Checked)
-        
-        # Update start button state
-        self._update_start_button_state()
+        self.station_model.set_all_checked(True)
+        self._on_tree_check_state_changed()
         
     def _deselect_all_components(self):
         """Deselect all components."""
-        # Get all top-level items
-        root = self.station_tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            item = root.child(i)
-            item.setCheckState(0, Qt.Unchecked)
-        
-        # Update start button state
-        self._update_start_button_state()
-        
-    def _on_tree_item_changed(self, item, column):
-        """Handle changes to tree item check state."""
-        # Block signals to prevent recursive signal handling
-        self.station_tree.blockSignals(True)
-        
-        # Propagate check state to children
-        if item.checkState(column) == Qt.Checked:
-            self._set_children_check_state(item, Qt.Checked)
-        elif item.checkState(column) == Qt.Unchecked:
-            self._set_children_check_state(item, Qt.Unchecked)
-        
-        # Update parent check state
-        self._update_parent_check_state(item.parent())
+        self.station_model.set_all_checked(False)
+        self._on_tree_check_state_changed()
         
+    def _on_tree_check_state_changed(self):
+        """Handle changes to tree check state."""
         # Update component checkboxes based on tree selection
         self._sync_component_checkboxes()
         
-        # Unblock signals
-        self.station_tree.blockSignals(False)
-        
         # Update start button state
         self._update_start_button_state()
     
-    def _set_children_check_state(self, parent, state):
-        """Set check state for all children of parent item."""
-        for i in range(parent.childCount()):
-            child = parent.child(i)
-            child.setCheckState(0, state)
-            self._set_children_check_state(child, state)
-    
-    def _update_parent_check_state(self, parent):
-        """Update parent check state based on children."""
-        if parent is None:
-            return
-            
-        all_checked = True
-        all_unchecked = True
-        
-        for i in range(parent.childCount()):
-            child = parent.child(i)
-            if child.checkState(0) == Qt.Checked:
-                all_unchecked = False
-            else:
-                all_checked = False
-        
-        if all_checked:
-            parent.setCheckState(0, Qt.Checked)
-        elif all_unchecked:
-            parent.setCheckState(0, Qt.Unchecked)
-        else:
-            parent.setCheckState(0, Qt.PartiallyChecked)
-        
-        # Recursively update parent's parent
-        self._update_parent_check_state(parent.parent())
-    
     def _sync_component_checkboxes(self):
         """Synchronize component checkboxes with the tree selection state."""
-        # Block signals from component checkboxes
-        for checkbox in self.component_checkboxes.values():
-            checkbox.blockSignals(True)
-        
-        # Check each component
-        for component, items in self.end_nodes.items():
-            if component in self.component_checkboxes:
-                # Determine checkbox state based on component items
-                all_checked = all(item.checkState(0) == Qt.Checked for item in items) if items else False
-                any_checked = any(item.checkState(0) == Qt.Checked for item in items) if items else False
+        # Check each component against its checked leaf counter
+        for component, checkbox in self.component_checkboxes.items():
+            checked = self.station_model.component_checked.get(component, 0)
+            total = self.station_model.component_total.get(component, 0)
+            
+            if total and checked == total:
+                state = Qt.Checked
+            elif checked:
+                state = Qt.PartiallyChecked
+            else:
+                state = Qt.Unchecked
                 
-                if all_checked:
-                    self.component_checkboxes[component].setCheckState(Qt.Checked)
-                elif any_checked:
-                    self.component_checkboxes[component].setCheckState(Qt.PartiallyChecked)
-                else:
-                    self.component_checkboxes[component].setCheckState(Qt.Unchecked)
-        
-        # Unblock signals
-        for checkbox in self.component_checkboxes.values():
-            checkbox.blockSignals(False)
+            # Block signals from the checkbox while its state is synced
+            if checkbox.checkState() != state:
+                with QSignalBlocker(checkbox):
+                    checkbox.setCheckState(state)
     
     def _get_checked_paths(self):
-        """Get all checked paths from the tree."""
-        checked_paths = []
-        
-        # Process all end nodes (components)
-        for component, items in self.end_nodes.items():
-            for item in items:
-                # Only include checked or partially checked items
-                check_state = item.checkState(0)
-                if check_state != Qt.Unchecked:
-                    # Build path by traversing backwards from leaf to root
-                    path = self._build_path_from_item(item)
-
-                    if path:
-                        checked_paths.append(Path(self.output_dir) / path)
-        
-        return checked_paths
-    
-    def _build_path_from_item(self, item):
-        """Build a path by traversing backwards from a tree item to the root."""
-        path_parts = []
-        current = item
-        
-        # Traverse up the tree, collecting path parts
-        while current:
-            path_parts.insert(0, current.text(0))
-            current = current.parent()
-        
-        # Join path parts with OS-specific separator
-        if path_parts:
-            return os.path.join(*path_parts)
-        return ""
+        """Get all checked paths from the tree, by component in tree order."""
+        checked_leaves = self.station_model.checked_leaves
+        return [self.output_dir / node.path
+                for nodes in self.end_nodes.values()
+                for node in nodes if node in checked_leaves]
     
     def _select_component_for_all(self, component, state):
         """Select all directories with the given component."""
         try:
-            # Block signals to prevent recursive updates
-            self.station_tree.blockSignals(True)
-            
-            # Update all tree items for this component
+            # Update all tree nodes for this component in one batch
             if component in self.end_nodes:
-                for item in self.end_nodes[component]:
-                    item.setCheckState(0, Qt.Checked if state else Qt.Unchecked)
-                    
-                    # Update parent check states
-                    parent = item.parent()
-                    while parent:
-                        self._update_parent_check_state(parent)
-                        parent = parent.parent()
-            
-            # Unblock signals
-            self.station_tree.blockSignals(False)
+                self.station_model.set_leaves_checked(self.end_nodes[component], state)
             
             # Update start button state
             self._update_start_button_state()
@@ -793,8 +892,7 @@ class CreateFileDialog(QDialog):
     
     def _update_start_button_state(self):
         """Update the start button state based on checked items."""
-        checked_paths = self._get_checked_paths()
-        self.start_button.setEnabled(len(checked_paths) > 0)
+        self.start_button.setEnabled(bool(self.station_model.checked_leaves))
     
     def start_processing(self):
         """Start processing files."""
@@ -864,9 +962,12 @@ class CreateFileDialog(QDialog):
         """Show error message."""
         QMessageBox.critical(self, "Error", message) 
 
-    def closeEvent(self, event):
-        """Handle dialog close event."""
-        # Stop any running worker thread
+    def _stop_worker(self):
+        """Cancel a running worker without blocking the GUI thread.
+        
+        The thread is left to drain in the background and the dialog is only
+        deleted once it has finished.
+        """
         try:
             if hasattr(self, 'thread') and self.thread:
                 # Try to check if thread is running, but handle case where C++ object is deleted
@@ -878,34 +979,25 @@ class CreateFileDialog(QDialog):
                 if is_running:
                     if hasattr(self, 'worker') and self.worker:
                         self.worker.cancel()
+                    try:
+                        self.thread.finished.disconnect(self._on_processing_finished)
+                    except TypeError:
+                        pass  # Already stopping
+                    self.thread.finished.connect(self.deleteLater, Qt.UniqueConnection)
                     self.thread.quit()
-                    self.thread.wait(1000)  # Wait up to 1 second for thread to finish
         except Exception as e:
             logger.debug(f"Error during thread cleanup: {e}")
             self.thread = None
             self.worker = None
             
+    def closeEvent(self, event):
+        """Handle dialog close event."""
+        # Stop any running worker thread
+        self._stop_worker()
         super().closeEvent(event)
         
     def reject(self):
         """Handle dialog rejection (e.g., Escape key)."""
         # Stop any running worker thread
-        try:
-            if hasattr(self, 'thread') and self.thread:
-                # Try to check if thread is running, but handle case where C++ object is deleted
-                try:
-                    is_running = self.thread.isRunning()
-                except RuntimeError:
-                    is_running = False
-                    
-                if is_running:
-                    if hasattr(self, 'worker') and self.worker:
-                        self.worker.cancel()
-                    self.thread.quit()
-                    self.thread.wait(1000)  # Wait up to 1 second for thread to finish
-        except Exception as e:
-            logger.debug(f"Error during thread cleanup: {e}")
-            self.thread = None
-            self.worker = None
-            
-        super().reject() 
\ No newline at end of file
+        self._stop_worker()
+        super().reject()
@@ -7,9 +7,12 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                            QProgressBar, QPushButton, QCheckBox,
                            QListWidgetItem, QMessageBox, QTextEdit,
                            QGroupBox, QComboBox, QFileDialog)
-from PyQt5.QtCore import Qt, QThread, QObject, pyqtSignal, QDateTime
+from PyQt5.QtCore import (Qt, QThread, QObject, pyqtSignal, QDateTime,
+                          QRunnable, QThreadPool)
 import json
 import os
+import threading
+from functools import lru_cache
 from pathlib import Path
 import logging
 import numpy as np
@@ -25,6 +28,31 @@ from utils.constants import DEFAULT_OUTPUT_FOLDER
 
 logger = logging.getLogger(__name__)
 
+NS_PER_MINUTE = 60 * 1_000_000_000
+NS_PER_HOUR = 60 * NS_PER_MINUTE
+
+# Strips ISO 8601 punctuation so timestamps read as YYYYMMDDHHMMSS
+_TIMESTAMP_TRANSLATION = str.maketrans('', '', '-:T')
+
+
+class FileCutRunnable(QRunnable):
+    """Runnable cutting a single file on a thread pool."""
+    
+    def __init__(self, worker, filename: str):
+        """Initialize runnable.
+        
+        Args:
+            worker: FileProcessingWorker holding the cut parameters and signals
+            filename: Path of file to cut
+        """
+        super().__init__()
+        self.worker = worker
+        self.filename = filename
+        
+    def run(self):
+        """Cut the file."""
+        self.worker.process_file_task(self.filename)
+
 class FileProcessingWorker(BaseToolWorker):
     """Worker for processing files in a separate thread."""
     
@@ -46,6 +74,53 @@ class FileProcessingWorker(BaseToolWorker):
         self._is_cancelled = False
         self.trace_num = 1  # Default to single component
         self.components = []  # Component(channel) names from data.json or file's name
+        self._completed = 0
+        self._completed_lock = threading.Lock()
+
+    def run(self):
+        """Cut all files in the list, one thread pool task per file."""
+        total_files = len(self.file_list)
+        if total_files == 0:
+            logger.warning("No files to process")
+            self.finished.emit()
+            return
+            
+        self._completed = 0
+        self._project_path = Path(self.project_dir)
+        
+        # Memoize parser results; rebuilt on every run so a new parser is picked up
+        self._parse_filename = lru_cache(maxsize=4096)(self.parser.parse_filename)
+        self._folder_architecture = lru_cache(maxsize=4096)(self._get_folder_architecture)
+        
+        pool = QThreadPool()
+        pool.setMaxThreadCount(QThread.idealThreadCount())
+        for filename in self.file_list:
+            pool.start(FileCutRunnable(self, filename))
+        pool.waitForDone()
+        
+        self.progress.emit(100)
+        self.flush_errors()
+        self.finished.emit()
+        
+    def process_file_task(self, filename: str):
+        """Process a single file on a pool thread and report overall progress."""
+        if self._is_cancelled:
+            return
+            
+        try:
+            self.process_file(filename)
+        except Exception as e:
+            logger.error(f"Error processing file {filename}: {e}")
+            self.report_error(str(e))
+            
+        with self._completed_lock:
+            self._completed += 1
+            completed = self._completed
+        self.report_progress(completed * 100 // len(self.file_list))
+        
+    def _get_folder_architecture(self, parts_tuple: tuple) -> str:
+        """Get folder architecture for parsed parts given as a sorted items tuple."""
+        return self.parser.get_folder_architecture(dict(parts_tuple))
 
     def process_file(self, filename: str):
         """Process a single file."""
@@ -57,11 +132,11 @@ class FileProcessingWorker(BaseToolWorker):
         
         try:
             # Parse filename using FileNameParser
-            success, parsed_parts, _, error = self.parser.parse_filename(Path(filename).name)
+            success, parsed_parts, _, error = self._parse_filename(Path(filename).name)
             if not success:
                 error_msg = f"Cannot process file {filename}: {error}"
                 logger.error(error_msg)
-                self.error.emit(error_msg)
+                self.report_error(error_msg)
                 return
                 
             # Get file info from parsed parts
@@ -74,15 +149,25 @@ class FileProcessingWorker(BaseToolWorker):
             logger.info(f"Using parts for file: Net={net}, STA={sta}, LOC={loc}, NEZ={cha}")
             
             # Get file path
-            file_path = Path(self.project_dir) / filename
+            file_path = self._project_path / filename
             
             # Get file format and reader
             file_format, reader = get_file_format_and_reader(filename, self.project_data)
             if not reader:
                 error_msg = f"No suitable reader found for format: {file_format}"
                 logger.error(error_msg)
-                self.error.emit(error_msg)
+                self.report_error(error_msg)
+                return
+
+            # Get writer for the output format once for all traces and segments
+            writer_class = self.plugin_manager.get_reader(self.file_format)
+            if not writer_class:
+                msg = f"No suitable reader found for format: {self.file_format}"
+                logger.error(msg)
+                self.report_error(msg)
                 return
+            writer = writer_class()
+            write_segment = writer.write
 
             # Read data using the reader
             try:
@@ -90,7 +175,7 @@ class FileProcessingWorker(BaseToolWorker):
                 if data is None:
                     error_msg = f"Failed to read data from file: {filename}"
                     logger.error(error_msg)
-                    self.error.emit(error_msg)
+                    self.report_error(error_msg)
                     return
                     
                 # Get components from data.json for three traces
@@ -98,35 +183,39 @@ class FileProcessingWorker(BaseToolWorker):
                     if not self.project_data or 'data_params' not in self.project_data:
                         error_msg = "Cannot process three-trace file: data.json not properly configured"
                         logger.error(error_msg)
-                        self.error.emit(error_msg)
+                        self.report_error(error_msg)
                         return
                         
                     params = self.project_data['data_params']
                     if 'componentName' not in params:
                         error_msg = "Cannot process three-trace file: component names not found in data.json"
                         logger.error(error_msg)
-                        self.error.emit(error_msg)
+                        self.report_error(error_msg)
                         return
                         
-                    self.components = params['componentName'].split(',')
-                    if len(self.components) != len(data):
-                        error_msg = f"Number of components ({len(self.components)}) does not match number of traces ({len(data)})"
+                    components = params['componentName'].split(',')
+                    if len(components) != len(data):
+                        error_msg = f"Number of components ({len(components)}) does not match number of traces ({len(data)})"
                         logger.error(error_msg)
-                        self.error.emit(error_msg)
+                        self.report_error(error_msg)
                         return
                 else:
                     # For single trace, use the channel name
-                    self.components = [cha]
+                    components = [cha]
                     
+                # Keep only the traces so the Stream can be freed early
+                traces = data.traces
+                del data
+                
                 # Process each trace
-                for i, trace in enumerate(data):
-                    data_array = trace.data
+                for i, trace in enumerate(traces):
+                    data_array = np.asarray(trace.data)
                     sample_rate = trace.stats.sampling_rate
                     start_time = trace.stats.starttime
                     metadata = {
                         'network': net,
                         'station': sta,
-                        'channel': self.components[i] if i < len(self.components) else cha
+                        'channel': components[i] if i < len(components) else cha
                     }
                     
                     if data_array is None or sample_rate is None:
@@ -140,31 +229,15 @@ class FileProcessingWorker(BaseToolWorker):
                     # Then add the head_offset seconds and 1 minute
                     new_start_time = new_start_time + self.head_offset + 60
                     
-                    # Replace seconds and microseconds with 0 using UTCDateTime methods
-                    new_start_time = UTCDateTime(
-                        year=new_start_time.year,
-                        month=new_start_time.month,
-                        day=new_start_time.day,
-                        hour=new_start_time.hour,
-                        minute=new_start_time.minute,
-                        second=0,
-                        microsecond=0
-                    )
+                    # Replace seconds and microseconds with 0 on the nanosecond epoch
+                    start_ns = new_start_time.ns
+                    start_ns -= start_ns % NS_PER_MINUTE
                     
                     # If start_on_hour is True, round up to the next hour
                     if self.start_on_hour:
-                        # Round up to the next hour
-                        if new_start_time.minute > 0:
-                            new_start_time = new_start_time + 3600  # Add one hour
-                            new_start_time = UTCDateTime(
-                                year=new_start_time.year,
-                                month=new_start_time.month,
-                                day=new_start_time.day,
-                                hour=new_start_time.hour,
-                                minute=0,
-                                second=0,
-                                microsecond=0
-                            )
+                        start_ns += (NS_PER_HOUR - start_ns % NS_PER_HOUR) % NS_PER_HOUR
+                    
+                    new_start_time = UTCDateTime(ns=start_ns)
                     
                     # Calculate the start_index based on the new start time
                     time_diff = new_start_time - start_time
@@ -184,94 +257,92 @@ class FileProcessingWorker(BaseToolWorker):
                         logger.error(f"Invalid indices for file {filename}: start_index={start_index}, file_end_index={file_end_index}")
                         return
 
-                    # Get reader for the specified format
-                    reader_class = self.plugin_manager.get_reader(self.file_format)
-                    if not reader_class:
-                        msg = f"No suitable reader found for format: {self.file_format}"
-                        logger.error(msg)
-                        self.error.emit(msg)
+                    # Process and save data in time_length increments
+                    segment_samples = int(self.time_length * sample_rate)
+                    # If there's overlap, move forward by (1 - overlap_percent) of the time length
+                    overlap_samples = int(self.time_length * sample_rate * (self.overlap_percent / 100))
+                    step = segment_samples - overlap_samples
+                    if segment_samples <= 0 or step <= 0:
+                        logger.error(f"Invalid segment length or overlap for file {filename}")
                         return
 
-                    # Create reader instance
-                    reader = reader_class()
+                    # Only full time_length segments are written
+                    n_segments = max((file_end_index - start_index - segment_samples) // step + 1, 0)
+                    segment_end = start_index + n_segments * step
+                    if segment_end < file_end_index:
+                        logger.info(f"Skipping incomplete segment: {segment_end} to {file_end_index}")
 
-                    # Process and save data in time_length increments
-                    current_start = start_index
-                    segment_count = 0  # Add counter for segments
+                    # View all segments as rows of a 2-D array without copying the data
+                    segments = np.lib.stride_tricks.as_strided(
+                        data_array[start_index:],
+                        shape=(n_segments, segment_samples),
+                        strides=(step * data_array.strides[0], data_array.strides[0])
+                    )
+
+                    # Time of each segment based on new_start_time and segment count
+                    step_seconds = self.time_length * (1 - self.overlap_percent/100)
+                    segment_ns = new_start_time.ns + np.arange(n_segments, dtype=np.int64) * int(round(step_seconds * 1e9))
+                    segment_time_strs = np.datetime_as_string(segment_ns.astype('datetime64[ns]'), unit='s')
+
+                    # Create parsed parts dictionary for folder architecture
+                    parsed_parts = {
+                        'Network': net,
+                        'Station': sta,
+                        'Location': loc,
+                        'Channel': metadata['channel']
+                    }
                     
-                    while current_start < file_end_index:
+                    # Get folder architecture
+                    folder_arch_path = Path(self._folder_architecture(tuple(sorted(parsed_parts.items()))))
+                        
+                    # Create output directory using output folder from project parameters
+                    output_folder = self._project_path / DEFAULT_OUTPUT_FOLDER  # Default value
+                    if self.project_data and 'data_params' in self.project_data:
+                        output_folder = self.project_data['data_params'].get('outputFolder', output_folder)
+                    out_dir = output_folder / folder_arch_path.relative_to(folder_arch_path.anchor)
+                    
+                    # Create output directory and emit signal
+                    if n_segments > 0:
+                        out_dir = self.create_output_directory(out_dir)
+                    file_ext = self.file_format.lower()
+
+                    for segment_count in range(n_segments):
                         if self._is_cancelled:  # Check before each segment
                             logger.info("Processing cancelled during segmentation")
                             return
 
-                        # Calculate end index for this segment
-                        current_end = min(current_start + int(self.time_length * sample_rate), file_end_index)
-                        
-                        # Skip if this segment is not a full time_length
-                        if current_end - current_start < int(self.time_length * sample_rate):
-                            logger.info(f"Skipping incomplete segment: {current_start} to {current_end}")
-                            break
-                        
-                        # Slice data for this segment
-                        segment_data = data_array[current_start:current_end]
-
-                        # Calculate time for this segment based on new_start_time and segment count
-                        current_time = new_start_time + (segment_count * self.time_length * (1 - self.overlap_percent/100))
-                        current_time_str = current_time.strftime("%Y%m%d%H%M%S")
-                        
-                        # Create parsed parts dictionary for folder architecture
-                        parsed_parts = {
-                            'Network': net,
-                            'Station': sta,
-                            'Location': loc,
-                            'Channel': metadata['channel']
-                        }
-                        
-                        # Get folder architecture
-                        folder_arch_path = Path(self.parser.get_folder_architecture(parsed_parts))
-                            
-                        # Create output directory using output folder from project parameters
-                        output_default = Path(self.project_dir) / DEFAULT_OUTPUT_FOLDER  # Default value
-                        if self.project_data and 'data_params' in self.project_data:
-                            output_folder = self.project_data['data_params'].get('outputFolder', output_default)
-                        out_dir = output_folder / folder_arch_path.relative_to(folder_arch_path.anchor)
-                        
-                        # Create output directory and emit signal
-                        out_dir = self.create_output_directory(out_dir)
+                        segment_data = segments[segment_count]
+                        current_time = UTCDateTime(ns=int(segment_ns[segment_count]))
+                        current_time_str = segment_time_strs[segment_count].translate(_TIMESTAMP_TRANSLATION)
                         
                         # Create output filename
-                        out_file = out_dir / f"{sta}.{metadata['channel']}.{current_time_str}.{self.file_format.lower()}"
+                        out_file = out_dir / f"{sta}.{metadata['channel']}.{current_time_str}.{file_ext}"
                         logger.info(f"Writing output to: {out_file}")
 
-                        # Create new trace with segment data
-                        tr_new = Trace(data=np.array(segment_data))
+                        # Create new trace with segment data, copying only if the view is not contiguous
+                        if not segment_data.flags.c_contiguous:
+                            segment_data = np.ascontiguousarray(segment_data)
+                        tr_new = Trace(data=segment_data)
                         tr_new.stats.station = sta
                         tr_new.stats.starttime = current_time
                         tr_new.stats.sampling_rate = sample_rate
                         tr_new.stats.network = metadata.get('network', '')
                         tr_new.stats.channel = metadata['channel']
                         
-                        # Save segment using the reader's write method
+                        # Save segment using the writer's write method
                         try:
-                            reader.write(str(out_file), tr_new)
+                            write_segment(str(out_file), tr_new)
                             logger.info(f"Saved segment: {out_file}")
                         except Exception as e:
                             msg = f"Failed to write segment using {self.file_format} reader: {str(e)}"
                             logger.error(msg)
-                            self.error.emit(msg)
+                            self.report_error(msg)
                             return
 
-                        # Update indices for the next segment
-                        # If there's overlap, move forward by (1 - overlap_percent) of the time length
-                        overlap_samples = int(self.time_length * sample_rate * (self.overlap_percent / 100))
-                        current_start = current_end - overlap_samples
-                        segment_count += 1  # Increment segment counter
-
-                        # Emit progress update
-                        progress = int((current_start / total_samples) * 100)
-                        self.progress.emit(progress)
-
                         logger.info(f"Updated start time: {current_time}")
+                    
+                    # Release the source trace once all of its segments are written
+                    traces[i] = None
             except Exception as e:
                 logger.error(f"Error reading file {filename}: {str(e)}")
                 return
@@ -406,7 +477,7 @@ class FileCutDialog(BaseToolDialog):
         self.worker.finished.connect(self.worker.deleteLater)
         self.thread.finished.connect(self.thread.deleteLater)
         self.thread.finished.connect(self._on_processing_finished)
-        self.worker.error.connect(self._show_error)
+        self.worker.error.connect(self._show_errors)
         
         # Disable UI
         self.start_button.setEnabled(False)
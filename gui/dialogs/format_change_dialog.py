@@ -6,13 +6,20 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                            QComboBox, QPushButton, QProgressBar, QMessageBox,
                            QGroupBox, QTextEdit, QCheckBox, QLineEdit, QListWidget,
                            QFileDialog, QListWidgetItem)
-from PyQt5.QtCore import Qt, QThread, QObject, pyqtSignal
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool
 import os
-from pathlib import Path
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import PurePath
+from typing import Tuple
 import logging
 import shutil
 import json
 from obspy import Stream
+from obspy.io.mseed.util import get_record_information
 
 from core.plugin_manager import PluginManager
 from utils.config import config
@@ -22,13 +29,48 @@ from utils.constants import DEFAULT_OUTPUT_FOLDER
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1024)
+def _strip_anchor(path: str) -> str:
+    """Strip the drive and root from a folder architecture path."""
+    pure_path = PurePath(path)
+    return str(pure_path.relative_to(pure_path.anchor))
+
+
+@dataclass(frozen=True)
+class _RunConfig:
+    """Settings shared by every file of a format change run."""
+    
+    __slots__ = ('component_names', 'output_folder', 'final_ext', 'reader_cls',
+                 'writer_cls', 'same_format', 'mseed_passthrough')
+    
+    component_names: Tuple[str, ...]
+    output_folder: str
+    final_ext: str
+    reader_cls: type
+    writer_cls: type
+    same_format: bool
+    mseed_passthrough: bool
+
+
+class FormatChangeRunnable(QRunnable):
+    """Runnable running a format change job on the global thread pool."""
+    
+    def __init__(self, worker):
+        """Initialize runnable.
+        
+        Args:
+            worker: FormatChangeWorker holding the job parameters and signals
+        """
+        super().__init__()
+        self.worker = worker
+        
+    def run(self):
+        """Run the format change job."""
+        self.worker.run()
+
 class FormatChangeWorker(BaseToolWorker):
     """Worker for changing file formats in a separate thread."""
     
-    progress = pyqtSignal(int)
-    finished = pyqtSignal()
-    error = pyqtSignal(str)
-    
     def __init__(self):
         """Initialize worker."""
         super().__init__()
@@ -44,14 +86,16 @@ class FormatChangeWorker(BaseToolWorker):
         
         # Initialize plugin manager
         self.plugin_manager = PluginManager()
-        self.readers = self.plugin_manager.get_available_readers()
+        self._readers_norm = {}  # Reader classes keyed on lowercase format without dot
+        self.cfg = None  # Run settings, resolved at the start of run()
+        self._known_dirs = set()  # Output directories already created this run
         
-        # Add cancellation flag
-        self._is_cancelled = False
+        # Add cancellation flag, shared by all conversion threads
+        self._cancel_event = threading.Event()
         
     def cancel(self):
         """Cancel the processing."""
-        self._is_cancelled = True
+        self._cancel_event.set()
         
     def process_file(self, filepath: str):
         """Process a single file.
@@ -59,16 +103,25 @@ class FormatChangeWorker(BaseToolWorker):
         Args:
             filepath: Path of file to process
         """
-        logger.info(f"Processing file: {filepath}")
+        if self._cancel_event.is_set():
+            return
+            
+        logger.info("Processing file: %s", filepath)
         self.status_update.emit(f"Processing file: {os.path.basename(filepath)}")
         
         try:
             # Parse filename using FileNameParser
-            success, parsed_parts, _, error = self.parse_filename(Path(filepath).name)
+            filename = os.path.basename(filepath)
+            try:
+                success, parsed_parts, _, error = self._parse_filename_cached(filename)
+            except Exception as e:
+                logger.error(f"Error parsing filename '{filename}': {str(e)}")
+                self.report_error(f"Cannot process file {filepath}: {str(e)}")
+                return
             if not success:
                 error_msg = f"Cannot process file {filepath}: {error}"
                 logger.error(error_msg)
-                self.error.emit(error_msg)
+                self.report_error(error_msg)
                 return
                 
             # Get file info from parsed parts
@@ -78,42 +131,49 @@ class FormatChangeWorker(BaseToolWorker):
             cha = parsed_parts.get('Channel', '')
             
             # Log the parts we're using
-            logger.info(f"Using parts for file: Net={net}, STA={sta}, LOC={loc}, NEZ={cha}")
-            
-            # Get appropriate reader - try both with and without dot, and both cases
-            orig_format = self.orig_format.lower()  # Convert to lowercase
-            reader_class = (self.plugin_manager.get_available_readers().get(f".{orig_format}") or 
-                          self.plugin_manager.get_available_readers().get(orig_format) or
-                          self.plugin_manager.get_available_readers().get(f".{orig_format.upper()}") or
-                          self.plugin_manager.get_available_readers().get(orig_format.upper()))
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Using parts for file: Net=%s, STA=%s, LOC=%s, NEZ=%s", net, sta, loc, cha)
             
-            if not reader_class:
-                error_msg = f"No reader found for format: {self.orig_format}"
-                logger.error(error_msg)
-                self.error.emit(error_msg)
-                return
-                
-            reader = reader_class()
+            # Reader class is resolved once per run
+            cfg = self.cfg
+            reader = cfg.reader_cls()
             
-            # Read data
-            file_path = Path(self.project_dir) / filepath
-            data = reader.read(str(file_path))
+            # Read data; when the format does not change headers are enough for
+            # a single-component file, which is linked or copied as is, and for
+            # MiniSEED whose channels each form a single trace, since the records
+            # are copied as is
+            file_path = os.path.join(self.project_dir, filepath)
+            passthrough = cfg.mseed_passthrough
+            if cfg.same_format:
+                data = reader.read_header(file_path)
+                if data is not None and len(data) == 1:
+                    self._link_single(parsed_parts, file_path, data, cha, sta)
+                    return
+                passthrough = passthrough and data is not None and len({trace.id for trace in data}) == len(data)
+                if not passthrough:
+                    data = reader.read(file_path)
+            else:
+                data = reader.read(file_path)
             if data is None:
                 error_msg = f"Failed to read data from {filepath}"
                 logger.error(error_msg)
-                self.error.emit(error_msg)
+                self.report_error(error_msg)
                 return
                 
             # Get number of traces
             trace_num = len(data)
             
+            # Single-component files are written straight from the read stream
+            if trace_num == 1 and not passthrough:
+                self._write_single(parsed_parts, data, cha, sta)
+                return
+                
             # Get component names from project data
             components = []
             if(trace_num == 1):
                 components = [cha]
             else:
-                if self.project_data and 'data_params' in self.project_data:
-                    components = self.project_data['data_params'].get('componentName', '').split(',')
+                components = cfg.component_names
             
             # If no components defined or number doesn't match, use default names
             if not components or len(components) != trace_num:
@@ -122,77 +182,238 @@ class FormatChangeWorker(BaseToolWorker):
                 else:
                     components = ['N', 'E', 'Z']
             
-            # Process each component
-            for i, (component, trace) in enumerate(zip(components, data)):
+            # Bind run invariants to locals for the component loop
+            get_folder_architecture = self.parser.get_folder_architecture
+            output_folder = cfg.output_folder
+            final_ext = cfg.final_ext
+            
+            # Keep only the traces so each one can be released once written
+            traces = data.traces
+            del data
+            
+            # Parsed parts for folder architecture, with the channel swapped per component
+            folder_parts = dict(parsed_parts)
+            
+            # Components recorded together share a start time, format it only once
+            first_ns = traces[0].stats.starttime.ns if traces else None
+            if traces and all(trace.stats.starttime.ns == first_ns for trace in traces):
+                shared_start_time = traces[0].stats.starttime.strftime("%Y%m%d%H%M%S")
+            else:
+                shared_start_time = None
+            
+            # Work out the output file of each component first
+            targets = []
+            pending = Counter()
+            for i, (component, trace) in enumerate(zip(components, traces)):
+                if self._cancel_event.is_set():
+                    return
+                    
                 try:
-                    # Create parsed parts dictionary for folder architecture
-                    folder_parts = parsed_parts.copy()
                     folder_parts['Channel'] = component
                     
-                    # Get folder architecture
-                    folder_arch_path = Path(self.parser.get_folder_architecture(folder_parts))
+                    # Get folder architecture relative to the output folder
+                    folder_arch = _strip_anchor(get_folder_architecture(folder_parts))
                     
                     # Create output directory using output folder from project parameters
-                    output_default = Path(self.project_dir) / DEFAULT_OUTPUT_FOLDER  # Default value
-                    if self.project_data and 'data_params' in self.project_data:
-                        output_folder = self.project_data['data_params'].get('outputFolder', output_default)
-                    out_dir = output_folder / folder_arch_path.relative_to(folder_arch_path.anchor)
-                    
-                    # Create output directory and emit signal
-                    out_dir = self.create_output_directory(out_dir)
+                    out_dir = os.path.join(output_folder, folder_arch)
                     
                     # Get start time from data
-                    start_time = trace.stats.starttime.strftime("%Y%m%d%H%M%S")
+                    start_time = shared_start_time or trace.stats.starttime.strftime("%Y%m%d%H%M%S")
                     
                     # Create output filename
-                    out_file = out_dir / f"{sta}.{component}.{start_time}.{self.final_format.lower()}"
-                    logger.info(f"Writing component {i} ({component}) to: {out_file}")
+                    out_file = os.path.join(out_dir, f"{sta}.{component}.{start_time}.{final_ext}")
+                    targets.append((i, component, out_dir, out_file))
+                    pending[out_file] += 1
                     
-                    # Get writer for final format
-                    final_format = self.final_format.lower()
-                    writer_class = (self.plugin_manager.get_available_readers().get(f".{final_format}") or 
-                                  self.plugin_manager.get_available_readers().get(final_format) or
-                                  self.plugin_manager.get_available_readers().get(f".{final_format.upper()}") or
-                                  self.plugin_manager.get_available_readers().get(final_format.upper()))
+                except Exception as e:
+                    logger.error(f"Error processing component {component}: {str(e)}")
                     
-                    if not writer_class:
-                        raise ValueError(f"No writer found for format: {self.final_format}")
+            if passthrough and os.path.abspath(file_path) in {os.path.abspath(target[3]) for target in targets}:
+                # Overwriting the source file needs the decoded data in memory first
+                traces = reader.read(file_path).traces
+                passthrough = False
+                
+            if passthrough:
+                # Copy the records of each channel into its output file
+                out_files = {}
+                for i, component, out_dir, out_file in targets:
+                    if out_dir not in self._known_dirs:
+                        self.create_output_directory(out_dir)
+                        self._known_dirs.add(out_dir)
+                    logger.info("Writing component %d (%s) to: %s", i, component, out_file)
+                    out_files[traces[i].id] = out_file
+                self._split_mseed_by_channel(file_path, out_files)
+                return
+                
+            # Write each output file once, as soon as its last trace is collected
+            writer = cfg.writer_cls()
+            out_traces = defaultdict(list)
+            out_stream = Stream()  # Reused for every write of this file
+            for i, component, out_dir, out_file in targets:
+                if self._cancel_event.is_set():
+                    return
+                    
+                try:
+                    out_traces[out_file].append(traces[i])
+                    pending[out_file] -= 1
+                    if pending[out_file]:
+                        continue
                         
-                    writer = writer_class()
-                    writer.write(str(out_file), Stream([trace]))
+                    # Create output directory and emit signal, once per directory
+                    if out_dir not in self._known_dirs:
+                        self.create_output_directory(out_dir)
+                        self._known_dirs.add(out_dir)
+                    
+                    logger.info("Writing component %d (%s) to: %s", i, component, out_file)
+                    out_stream.traces = out_traces.pop(out_file)
+                    writer.write(out_file, out_stream)
+                    out_stream.traces = []
                     
-                    if not out_file.exists():
+                    if not os.path.exists(out_file):
                         logger.error(f"Failed to create output file: {out_file}")
                     else:
-                        logger.info(f"Successfully wrote output file: {out_file}")
+                        logger.info("Successfully wrote output file: %s", out_file)
                         
                 except Exception as e:
                     logger.error(f"Error processing component {component}: {str(e)}")
+                finally:
+                    traces[i] = None
                     
         except Exception as e:
             logger.error(f"Error processing file {filepath}: {str(e)}")
             raise
         
-    def parse_filename(self, filename: str) -> tuple:
-        """Parse filename using FileNameParser.
+    def _write_single(self, parsed_parts: dict, data, cha: str, sta: str):
+        """Write a single-component file.
+        
+        The channel of the parsed parts already names the component, so the
+        folder architecture and the read stream are used without copies.
         
         Args:
-            filename: Name of file to parse
+            parsed_parts: Parsed filename parts
+            data: Stream holding the single trace
+            cha: Channel (component) name
+            sta: Station name
+        """
+        out_dir, out_file = self._single_target(parsed_parts, data, cha, sta)
+        
+        try:
+            if out_dir not in self._known_dirs:
+                self.create_output_directory(out_dir)
+                self._known_dirs.add(out_dir)
+                
+            logger.info("Writing component 0 (%s) to: %s", cha, out_file)
+            self.cfg.writer_cls().write(out_file, data)
             
-        Returns:
-            Tuple containing:
-            - Success flag (bool)
-            - Dictionary of parsed parts (Dict[str, str])
-            - Channel flag (bool)
-            - Error message if any (str)
+            if not os.path.exists(out_file):
+                logger.error(f"Failed to create output file: {out_file}")
+            else:
+                logger.info("Successfully wrote output file: %s", out_file)
+                
+        except Exception as e:
+            logger.error(f"Error processing component {cha}: {str(e)}")
+            
+    def _link_single(self, parsed_parts: dict, file_path: str, data, cha: str, sta: str):
+        """Place a single-component file in the output tree without converting it.
+        
+        Used when the source and target formats are the same. The file is hard
+        linked, or copied when linking is not possible.
+        
+        Args:
+            parsed_parts: Parsed filename parts
+            file_path: Source file path
+            data: Header-only stream holding the single trace
+            cha: Channel (component) name
+            sta: Station name
         """
+        out_dir, out_file = self._single_target(parsed_parts, data, cha, sta)
+        if os.path.abspath(out_file) == os.path.abspath(file_path):
+            logger.info("Output file is the source file, nothing to do: %s", out_file)
+            return
+            
         try:
-            # Parse filename using the parser
-            return self.parser.parse_filename(filename)
+            if out_dir not in self._known_dirs:
+                self.create_output_directory(out_dir)
+                self._known_dirs.add(out_dir)
+                
+            logger.info("Linking component 0 (%s) to: %s", cha, out_file)
+            try:
+                os.link(file_path, out_file)
+            except OSError:
+                shutil.copy2(file_path, out_file)
+                
+            logger.info("Successfully wrote output file: %s", out_file)
             
         except Exception as e:
-            logger.error(f"Error parsing filename '{filename}': {str(e)}")
-            return False, {}, False, str(e)
+            logger.error(f"Error processing component {cha}: {str(e)}")
+            
+    def _single_target(self, parsed_parts: dict, data, cha: str, sta: str) -> tuple:
+        """Get the output directory and file of a single-component file.
+        
+        Args:
+            parsed_parts: Parsed filename parts
+            data: Stream holding the single trace
+            cha: Channel (component) name
+            sta: Station name
+            
+        Returns:
+            Tuple of output directory and output file path
+        """
+        folder_arch = _strip_anchor(self.parser.get_folder_architecture(parsed_parts))
+        out_dir = os.path.join(self.cfg.output_folder, folder_arch)
+        start_time = data[0].stats.starttime.strftime("%Y%m%d%H%M%S")
+        return out_dir, os.path.join(out_dir, f"{sta}.{cha}.{start_time}.{self.cfg.final_ext}")
+        
+    def _split_mseed_by_channel(self, file_path: str, out_files: dict):
+        """Copy MiniSEED records into per-channel files without decoding them.
+        
+        Args:
+            file_path: MiniSEED file to split
+            out_files: Output file path for each trace id (NET.STA.LOC.CHA)
+        """
+        handles = {}
+        try:
+            with open(file_path, 'rb') as src:
+                file_size = os.fstat(src.fileno()).st_size
+                offset = 0
+                while offset < file_size:
+                    record_length = get_record_information(src, offset=offset)['record_length']
+                    src.seek(offset)
+                    record = src.read(record_length)
+                    offset += record_length
+                    
+                    # Station, location, channel and network codes of the fixed header
+                    codes = [record[start:end].decode('ascii', 'replace').strip()
+                             for start, end in ((18, 20), (8, 13), (13, 15), (15, 18))]
+                    out_file = out_files.get('.'.join(codes))
+                    if out_file is None:
+                        continue
+                        
+                    if out_file not in handles:
+                        handles[out_file] = open(out_file, 'wb')
+                    handles[out_file].write(record)
+        finally:
+            for handle in handles.values():
+                handle.close()
+                
+        for out_file in out_files.values():
+            if not os.path.exists(out_file):
+                logger.error(f"Failed to create output file: {out_file}")
+            else:
+                logger.info("Successfully wrote output file: %s", out_file)
+                
+    def _resolve_format(self, fmt: str):
+        """Resolve the reader class for a format.
+        
+        The format is matched case-insensitively, with or without a leading dot.
+        
+        Args:
+            fmt: Format name
+            
+        Returns:
+            Reader class, or None if no plugin handles the format
+        """
+        return self._readers_norm.get(fmt.lower().lstrip('.'))
         
     def run(self):
         """Process all files in the list."""
@@ -202,20 +423,69 @@ class FormatChangeWorker(BaseToolWorker):
             self.finished.emit()
             return
             
-        for i, filename in enumerate(self.file_list):
-            if self._is_cancelled:
-                logger.info("Processing cancelled by user")
-                break
+        # Resolve reader and writer classes once for the whole run
+        self._readers_norm = {key.lower().lstrip('.'): reader_class
+                              for key, reader_class in self.plugin_manager.get_available_readers().items()}
+        reader_cls = self._resolve_format(self.orig_format)
+        writer_cls = self._resolve_format(self.final_format)
+        if not reader_cls or not writer_cls:
+            if not reader_cls:
+                error_msg = f"No reader found for format: {self.orig_format}"
+            else:
+                error_msg = f"No writer found for format: {self.final_format}"
+            logger.error(error_msg)
+            self.report_error(error_msg)
+            self.flush_errors()
+            self.finished.emit()
+            return
+            
+        # Freeze the settings shared by every file; same-format runs only move
+        # data, and MiniSEED is regrouped by channel
+        params = (self.project_data or {}).get('data_params', {})
+        final_ext = self.final_format.lower()
+        same_format = reader_cls is writer_cls
+        self.cfg = _RunConfig(
+            component_names=tuple(params.get('componentName', '').split(',')),
+            output_folder=str(params.get('outputFolder', os.path.join(self.project_dir, DEFAULT_OUTPUT_FOLDER))),
+            final_ext=final_ext,
+            reader_cls=reader_cls,
+            writer_cls=writer_cls,
+            same_format=same_format,
+            mseed_passthrough=same_format and final_ext == 'mseed',
+        )
+        
+        self._known_dirs = set()
+        
+        # Memoize filename parsing for this run's parser
+        self._parse_filename_cached = lru_cache(maxsize=8192)(self.parser.parse_filename)
+        
+        # Convert files concurrently, one task per file
+        last_progress = -1
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            tasks = {pool.submit(self.process_file, filename): filename
+                     for filename in self.file_list}
+            for done, future in enumerate(as_completed(tasks)):
+                filename = tasks[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Error processing file {filename}: {e}")
+                    self.report_error(str(e))
+                    
+                # Emit only when the percentage changes; report_progress caps the rate
+                progress = (done + 1) * 100 // total_files
+                if progress != last_progress:
+                    last_progress = progress
+                    self.report_progress(progress)
                 
-            try:
-                self.process_file(filename)
-                progress = int((i + 1) / total_files * 100)
-                self.progress.emit(progress)
-            except Exception as e:
-                logger.error(f"Error processing file {filename}: {e}")
-                self.error.emit(str(e))
+                if self._cancel_event.is_set():
+                    logger.info("Processing cancelled by user")
+                    for pending in tasks:
+                        pending.cancel()
+                    break
                 
         self.progress.emit(100)
+        self.flush_errors()
         self.finished.emit()
 
 class FormatChangeDialog(BaseToolDialog):
@@ -267,8 +537,7 @@ class FormatChangeDialog(BaseToolDialog):
             )
             return
             
-        # Create worker and thread
-        self.thread = QThread()
+        # Create worker; it stays in the GUI thread and only carries the signals
         self.worker = FormatChangeWorker()
         
         # Set worker parameters
@@ -287,15 +556,10 @@ class FormatChangeDialog(BaseToolDialog):
         # Connect worker signals
         self.connect_worker_signals()
         
-        # Set up thread
-        self.worker.moveToThread(self.thread)
-        self.thread.started.connect(self.worker.run)
+        # Results arrive through queued connections from the pool thread
         self.worker.progress.connect(self.progress.setValue)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-        self.thread.finished.connect(self._on_processing_finished)
-        self.worker.error.connect(self._show_error)
+        self.worker.finished.connect(self._on_processing_finished)
+        self.worker.error.connect(self._show_errors)
         
         # Disable UI
         self.start_button.setEnabled(False)
@@ -305,8 +569,27 @@ class FormatChangeDialog(BaseToolDialog):
         self.add_folders.setEnabled(False)
         self.reset_list.setEnabled(False)
         
-        # Start processing
-        self.thread.start()
+        # Start processing on the global thread pool
+        QThreadPool.globalInstance().start(FormatChangeRunnable(self.worker))
+
+    def _stop_worker(self):
+        """Cancel a running pooled job and detach its completion handler."""
+        if self.worker:
+            self.worker.cancel()
+            try:
+                self.worker.finished.disconnect(self._on_processing_finished)
+            except TypeError:
+                pass  # Already detached
+                
+    def reject(self):
+        """Handle dialog rejection (cancel button)."""
+        self._stop_worker()
+        super().reject()
+        
+    def closeEvent(self, event):
+        """Handle dialog close event."""
+        self._stop_worker()
+        super().closeEvent(event)
 
     def _on_processing_finished(self):
         """Handle processing completion."""
@@ -7,13 +7,16 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                            QProgressBar, QPushButton, QCheckBox,
                            QListWidgetItem, QMessageBox, QTextEdit,
                            QGroupBox, QComboBox, QSpinBox, QFileDialog)
-from PyQt5.QtCore import Qt, QThread, QObject, pyqtSignal
+from PyQt5.QtCore import Qt, QThread, QObject
 import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import logging
 import numpy as np
-from obspy import Stream, UTCDateTime
+from obspy import Trace, UTCDateTime
 from datetime import datetime
 
 from core.plugin_manager import PluginManager
@@ -25,17 +28,72 @@ from utils.constants import DEFAULT_OUTPUT_FOLDER
 
 logger = logging.getLogger(__name__)
 
+# Sample types the writers store; merged buffers use them so no upcast or
+# conversion copy happens on write
+_OUTPUT_DTYPES = {'sac': np.float32}
+
+class _ReadAhead:
+    """Read the files of a group ahead of the merge loop.
+    
+    Reads for the next few files are queued on a small thread pool, so the
+    merge loop finds its data ready instead of waiting on storage.
+    """
+    
+    def __init__(self, read, paths, depth):
+        """Initialize read-ahead.
+        
+        Args:
+            read: Reader function taking a file path
+            paths: File paths in merge order
+            depth: Number of files read ahead
+        """
+        self._read = read
+        self._paths = paths
+        self._depth = depth
+        self._futures = {}
+        self._pool = ThreadPoolExecutor(max_workers=depth)
+        
+    def queue(self, index):
+        """Queue reads of a file and the files after it.
+        
+        Args:
+            index: Index of the file in merge order
+        """
+        futures = self._futures
+        for done in [key for key in futures if key < index]:
+            del futures[done]
+        for ahead in range(index, min(index + self._depth, len(self._paths))):
+            if ahead not in futures:
+                futures[ahead] = self._pool.submit(self._read, self._paths[ahead])
+                
+    def get(self, index):
+        """Get the data of a file, queueing reads of the files after it.
+        
+        Args:
+            index: Index of the file in merge order
+            
+        Returns:
+            Data returned by the reader
+        """
+        self.queue(index)
+        return self._futures[index].result()
+        
+    def close(self):
+        """Drop queued reads and stop the pool."""
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._pool.shutdown(wait=True)
+
 class FileMergeWorker(BaseToolWorker):
     """Worker for merging files in a separate thread."""
     
-    progress = pyqtSignal(int)
-    finished = pyqtSignal()
-    error = pyqtSignal(str)
+    STATUS_INTERVAL = 0.1  # Minimum seconds between group status updates
     
     def __init__(self):
         """Initialize worker."""
         super().__init__()
-        self.file_list = []
+        self.file_list = []  # Absolute file paths
         self.merged_length = 3600  # Default to 1 hour
         self.file_format = 'MSEED'  # Will be set from data.json
         self.start_on_hour = False  # Will be set from data.json
@@ -47,6 +105,17 @@ class FileMergeWorker(BaseToolWorker):
         self._is_cancelled = False
         self.trace_num = 1  # Default to single component
         self.components = []  # Component(channel) names from data.json or file's name
+        self.num_workers = os.cpu_count()  # Groups merged concurrently
+        self.read_ahead = 8  # Files of a group read ahead of the merge
+        self._files_done = 0
+        self._total_files = 0
+        self._last_percent = -1
+        self._last_status_emit = 0.0
+        self._progress_lock = threading.Lock()
+        self._reader_class = None  # Resolved once per run
+        self._writer_class = None
+        self._output_folder = None
+        self.read_dtype = None  # Buffer sample type; None keeps the type read
 
     def run(self):
         """Process all files in the list."""
@@ -60,40 +129,61 @@ class FileMergeWorker(BaseToolWorker):
             # Sort files by name
             sorted_files = sorted(self.file_list)
             
+            # Resolve reader and writer once; the format comes from project data
+            file_format, reader = get_file_format_and_reader(sorted_files[0], self.project_data)
+            if not reader:
+                raise ValueError(f"No suitable reader found for format: {file_format}")
+            self._reader_class = type(reader)
+            self._writer_class = self.plugin_manager.get_reader(self.file_format)
+            if not self._writer_class:
+                raise ValueError(f"No writer found for format: {self.file_format}")
+                
+            # Output folder from project parameters, the same for every group
+            params = (self.project_data or {}).get('data_params', {})
+            self._output_folder = Path(params.get('outputFolder', Path(self.project_dir) / DEFAULT_OUTPUT_FOLDER))
+            self.read_dtype = _OUTPUT_DTYPES.get(self.file_format.lower())
+                
             # Check first 5 files for time order
             if not self._verify_time_order(sorted_files[:min(5, len(sorted_files))]):
-                self.error.emit("Warning: File time order may not match filename order. Proceeding with filename order.")
+                self.report_error("Warning: File time order may not match filename order. Proceeding with filename order.")
             
             # Group files by NET.STATION.CHANNEL.COMPONENT
             file_groups = self._group_files(sorted_files)
             if not file_groups:
                 raise ValueError("No valid file groups to process")
                 
-            # Process each group
+            # Groups are independent, so merge them concurrently; progress
+            # counts files across all groups
+            self._files_done = 0
+            self._last_percent = -1
+            self._total_files = sum(len(files) for _, files in file_groups.values())
             total_groups = len(file_groups)
-            for group_index, (group_key, files) in enumerate(file_groups.items()):
-                if self._is_cancelled:
-                    break
-                    
-                try:
-                    logger.info(f"Processing group {group_index + 1}/{total_groups}: {group_key}")
-                    self.status_update.emit(f"Processing group: {group_key}")
-                    self._process_group(group_key, files)
-                    
-                    # Update progress
-                    progress = int((group_index + 1) / total_groups * 100)
-                    self.progress.emit(progress)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing group {group_key}: {e}")
-                    self.error.emit(f"Error processing group {group_key}: {str(e)}")
+            with ThreadPoolExecutor(max_workers=self.num_workers) as pool:
+                tasks = {pool.submit(self._process_group, group_key, parsed_parts, files): group_key
+                         for group_key, (parsed_parts, files) in file_groups.items()}
+                for group_index, future in enumerate(as_completed(tasks)):
+                    group_key = tasks[future]
+                    try:
+                        future.result()
+                        logger.info(f"Processed group {group_index + 1}/{total_groups}: {group_key}")
+                        
+                    except Exception as e:
+                        logger.error(f"Error processing group {group_key}: {e}")
+                        self.report_error(f"Error processing group {group_key}: {str(e)}")
+                        
+                    if self._is_cancelled:
+                        for pending in tasks:
+                            pending.cancel()
+                        break
                     
             self.progress.emit(100)
+            self.flush_errors()
             self.finished.emit()
             
         except Exception as e:
             logger.error(f"Error in merge processing: {e}")
-            self.error.emit(str(e))
+            self.report_error(str(e))
+            self.flush_errors()
             self.finished.emit()
 
     def _verify_time_order(self, files):
@@ -102,25 +192,18 @@ class FileMergeWorker(BaseToolWorker):
             return True
             
         try:
-            # Get file format and reader
-            file_format, reader = get_file_format_and_reader(files[0], self.project_data)
-            if not reader:
-                return True  # Skip verification if no reader
+            # Reader resolved for this run
+            reader = self._reader_class()
                 
-            # Read start times
-            times = []
-            for filename in files:
-                try:
-                    file_path = Path(self.project_dir) / filename
-                    data = reader.read_header(str(file_path))
-                    if data:
-                        times.append(data[0].stats.starttime)
-                except Exception:
-                    continue
+            # Read start times; header reads wait on I/O, so run them concurrently
+            with ThreadPoolExecutor(max_workers=len(files)) as pool:
+                times = [t for t in pool.map(lambda filename: self._read_start_time(reader, filename), files)
+                         if t is not None]
                     
             # Check if times are in ascending order
             if len(times) > 1:
-                return all(times[i] <= times[i+1] for i in range(len(times)-1))
+                timestamps = np.fromiter(times, dtype=np.float64, count=len(times))
+                return bool((np.diff(timestamps) >= 0).all())
                 
             return True
             
@@ -128,28 +211,49 @@ class FileMergeWorker(BaseToolWorker):
             logger.error(f"Error verifying time order: {e}")
             return True  # Skip verification on error
 
+    def _read_start_time(self, reader, filename):
+        """Read the start timestamp of a file from its header.
+        
+        Args:
+            reader: Reader instance
+            filename: File path
+            
+        Returns:
+            POSIX timestamp of the first trace start, or None if it cannot be read
+        """
+        try:
+            data = reader.read_header(filename)
+            if data:
+                return data[0].stats.starttime.timestamp
+        except Exception:
+            pass
+        return None
+        
     def _group_files(self, files):
-        """Group files by NET.STATION.Location.CHANNEL"""
+        """Group files by NET.STATION.Location.CHANNEL
+        
+        Returns:
+            Dictionary mapping group keys to the parsed parts of the group's
+            first file and the list of its files
+        """
         groups = {}
+        parse_filename = self.parser.parse_filename
+        basename = os.path.basename
         for filename in files:
             try:
                 # Parse filename
-                success, parsed_parts, _, error = self.parser.parse_filename(Path(filename).name)
+                success, parsed_parts, _, error = parse_filename(basename(filename))
                 if not success:
                     logger.warning(f"Skipping file {filename}: {error}")
                     continue
                     
-                # Create group key
-                net = parsed_parts.get('Network', '')
-                sta = parsed_parts.get('Station', '')
-                loc = parsed_parts.get('Location', '')
-                cha = parsed_parts.get('Channel', '')
-                
-                group_key = f"{net}.{sta}.{loc}.{cha}"
-                
-                if group_key not in groups:
-                    groups[group_key] = []
-                groups[group_key].append(filename)
+                # Create group key; the first file's parts describe the group
+                get = parsed_parts.get
+                group_key = f"{get('Network', '')}.{get('Station', '')}.{get('Location', '')}.{get('Channel', '')}"
+                group = groups.get(group_key)
+                if group is None:
+                    group = groups[group_key] = (parsed_parts, [])
+                group[1].append(filename)
                 
             except Exception as e:
                 logger.error(f"Error grouping file {filename}: {e}")
@@ -157,145 +261,228 @@ class FileMergeWorker(BaseToolWorker):
                 
         return groups
 
-    def _process_group(self, group_key, files):
-        """Process a group of files."""
+    def _advance_progress(self, count=1):
+        """Count processed files and report overall progress.
+        
+        Args:
+            count: Number of files just processed
+        """
+        with self._progress_lock:
+            self._files_done += count
+            percent = int(self._files_done / self._total_files * 100)
+            if percent == self._last_percent:
+                return
+            self._last_percent = percent
+        self.report_progress(percent)
+        
+    def _report_status(self, message):
+        """Emit a status update, at most once every STATUS_INTERVAL seconds.
+        
+        Args:
+            message: Status message
+        """
+        now = time.monotonic()
+        if now - self._last_status_emit < self.STATUS_INTERVAL:
+            return
+        self._last_status_emit = now
+        self.status_update.emit(message)
+        
+    def _process_group(self, group_key, parsed_parts, files):
+        """Process a group of files.
+        
+        Runs on a pool thread; group state is kept in locals so groups can be
+        merged concurrently.
+        """
         if not files:
             return
             
-        # Get file format and reader
-        file_format, reader = get_file_format_and_reader(files[0], self.project_data)
-        if not reader:
-            raise ValueError(f"No suitable reader found for format: {file_format}")
+        self._report_status(f"Processing group: {group_key}")
+        
+        # Reader and writer instances for this group, from classes resolved per run
+        reader = self._reader_class()
+        writer = self._writer_class()
             
-        # Parse first file to get group info
-        success, parsed_parts, _, error = self.parser.parse_filename(Path(files[0]).name)
-        if not success:
-            raise ValueError(f"Failed to parse filename: {error}")
+        # Components written for each segment; single-component data uses the channel
+        if self.trace_num == 1:
+            components = [group_key.split(".")[-1]]
+        else:
+            components = self.components
             
-        # Process files in group
+        # Output directory of each component and file name parts are the same
+        # for every segment of the group; directories are created on first write
+        folder_parts = parsed_parts.copy()
+        out_dirs = []
+        for component in components:
+            folder_parts['Channel'] = component
+            folder_arch_path = Path(self.parser.get_folder_architecture(folder_parts))
+            out_dirs.append(self._output_folder / folder_arch_path.relative_to(folder_arch_path.anchor))
+        created_dirs = set()
+        station = parsed_parts['Station']
+        extension = self.file_format.lower()
+        
+        # Segment buffers of the group, kept per trace id for reuse by later segments
+        spare_buffers = {}
+        
+        # Total gap allowed in a segment before it is dropped
+        max_allowed_gap = self.merged_length * self.zero_padded_percent * 0.01
+        
+        # Process files in group, reading upcoming files in the background
         current_index = 0
-        total_files = len(files)
+        read_ahead = _ReadAhead(reader.read, files, self.read_ahead)
         
-        while current_index < len(files):
-            try:
-                # Read first file to get start time
-                data = reader.read(str(Path(self.project_dir) / files[current_index]))
-                if not data:
-                    current_index += 1
-                    self.progress.emit(int(current_index / total_files * 100))
-                    continue
+        try:
+            while current_index < len(files):
+                try:
+                    # Read only the header of the first file to get start time;
+                    # its data keeps decoding in the background meanwhile
+                    read_ahead.queue(current_index)
+                    header = reader.read_header(files[current_index])
+                    if not header:
+                        current_index += 1
+                        self._advance_progress()
+                        continue
                     
-                # Get start time
-                start_time = data[0].stats.starttime
+                    # Get start time
+                    start_time = header[0].stats.starttime
                 
-                # If start on hour is selected and current time is not on hour
-                if self.start_on_hour:
-                    if start_time.minute != 0 or start_time.second != 0:
-                        # Add hours until we reach the next hour
-                        start_time = start_time + (3600 - start_time.minute * 60 - start_time.second)
+                    # If start on hour is selected and current time is not on hour
+                    if self.start_on_hour:
+                        if start_time.minute != 0 or start_time.second != 0:
+                            # Add hours until we reach the next hour
+                            start_time = start_time + (3600 - start_time.minute * 60 - start_time.second)
                         
-                # Calculate end time
-                sampling_interval = data[0].stats.delta
-                end_time = start_time + self.merged_length - sampling_interval
+                    # Calculate end time
+                    sampling_interval = header[0].stats.delta
+                    end_time = start_time + self.merged_length - sampling_interval
                 
-                # Create output stream
-                output_stream = Stream()
+                    # One zero-filled buffer per trace id covers the whole segment;
+                    # file data is copied in at its sample offset
+                    nsamples = int(round(self.merged_length / sampling_interval))
+                    buffers = {}
+                    headers = {}
                 
-                # Read files until we have enough data
-                total_gap_time = 0
-                last_end_time = None
-                current_start = start_time
-                found_gap = False
+                    # Read files until we have enough data
+                    total_gap_time = 0
+                    last_end_time = None
+                    current_start = start_time
+                    found_gap = False
                 
                 
                 
-                while current_index < len(files):
-                    current_file = files[current_index]
-                    print(current_file)
+                    segment_first = current_index
+                    while current_index < len(files):
+                        current_file = files[current_index]
+                        logger.debug("Merging file: %s", current_file)
+                        
+                        # Stop mid-group on cancel; nothing of this segment is written
+                        if self._is_cancelled:
+                            return
                     
-                    # Read data
-                    data = reader.read(str(Path(self.project_dir) / current_file))
-                    if not data:
-                        current_index += 1
-                        continue
+                        # Read data
+                        data = read_ahead.get(current_index)
+                        if not data:
+                            current_index += 1
+                            continue
                         
-                    # Check for time gaps
-                    current_start = data[0].stats.starttime
-                    if last_end_time is not None:
-                        expected_start = last_end_time + sampling_interval
-                        if current_start > expected_start:
-                            gap_time = current_start - expected_start
-                            total_gap_time += gap_time
+                        # Check for time gaps
+                        current_start = data[0].stats.starttime
+                        if last_end_time is not None:
+                            expected_start = last_end_time + sampling_interval
+                            if current_start > expected_start:
+                                gap_time = current_start - expected_start
+                                
+                                # A single gap over the limit ends the segment on its own
+                                if gap_time > max_allowed_gap:
+                                    found_gap = True
+                                    break
+                                total_gap_time += gap_time
                             
-                            # Check if gap is too large
-                            max_allowed_gap = self.merged_length * (self.zero_padded_percent / 100.0)
-                            if total_gap_time > max_allowed_gap:
-                                # Mark that we found a gap and break
-                                found_gap = True
-                                break
+                                # Check if gap is too large
+                                if total_gap_time > max_allowed_gap:
+                                    # Mark that we found a gap and break
+                                    found_gap = True
+                                    break
                                     
-                    # Add data to output stream
-                    output_stream += data
-                    # Merge traces with same ID, fill empty gaps with zeros
-                    output_stream.merge(0,0)
-                    last_end_time = data[0].stats.endtime
-                    # Move to next file
-                    current_index += 1
+                        # Place the samples of each trace in its segment buffer
+                        for trace in data:
+                            stats = trace.stats
+                            if stats.delta != sampling_interval:
+                                raise ValueError(f"Sampling rate of {stats.id} in {current_file} differs from the segment")
+                            buffer = buffers.get(stats.id)
+                            if buffer is None:
+                                dtype = self.read_dtype or trace.data.dtype
+                                buffer = spare_buffers.pop(stats.id, None)
+                                if buffer is None or len(buffer) != nsamples or buffer.dtype != dtype:
+                                    buffer = np.zeros(nsamples, dtype=dtype)
+                                else:
+                                    buffer.fill(0)
+                                buffers[stats.id] = buffer
+                                headers[stats.id] = {'network': stats.network, 'station': stats.station,
+                                                     'location': stats.location, 'channel': stats.channel,
+                                                     'starttime': start_time, 'delta': sampling_interval}
+                            elif self.read_dtype is None and not np.can_cast(trace.data.dtype, buffer.dtype):
+                                # A later file holds wider samples, e.g. floats after ints;
+                                # widen the buffer rather than truncating them
+                                buffer = buffers[stats.id] = buffer.astype(
+                                    np.result_type(buffer.dtype, trace.data.dtype))
+                            offset = int(round((stats.starttime - start_time) / sampling_interval))
+                            first = max(offset, 0)
+                            last = min(offset + stats.npts, nsamples)
+                            if last > first:
+                                buffer[first:last] = trace.data[first - offset:last - offset]
+                                
+                        last_end_time = data[0].stats.endtime
+                        # Move to next file
+                        current_index += 1
                     
-                    # Check if we have enough data
-                    if output_stream[-1].stats.endtime >= end_time:
+                        # Check if we have enough data
+                        if data[-1].stats.endtime >= end_time:
      
-                        break
+                            break
                         
                     
                     
-                # If gap was found, skip saving and continue with new starting point
-                if found_gap:
-                    continue
-                
-                output_stream.trim(starttime=start_time, endtime=end_time, pad=True, fill_value=0)
+                    # If gap was found, skip saving and continue with new starting point
+                    self._advance_progress(current_index - segment_first)
+                    if found_gap:
+                        spare_buffers.update(buffers)
+                        continue
+                        
+                    # Trace ids in order of appearance; each buffer is wrapped when
+                    # its component is written and handed back for the next segment
+                    trace_ids = list(buffers)
 
-                if len(output_stream) > 0:                   
-                    if self.trace_num == 1 :
-                        self.components = group_key.split(".")[-1]                   
-                    # Create output directory based on components
-                    if  self.components:
-                        # Use components from data.json
-                        for i, component in enumerate(self.components):
-                            # Create parsed parts for folder architecture
-                            folder_parts = parsed_parts.copy()
-                            folder_parts['Channel']=component
-                            
-                            # Get folder architecture
-                            folder_arch_path = Path(self.parser.get_folder_architecture(folder_parts))
-                            
-                            # Create output directory using output folder from project parameters
-                            output_default = Path(self.project_dir) / DEFAULT_OUTPUT_FOLDER  # Default value
-                            if self.project_data and 'data_params' in self.project_data:
-                                output_folder = self.project_data['data_params'].get('outputFolder', output_default)
-                            out_dir = output_folder / folder_arch_path.relative_to(folder_arch_path.anchor)
+                    if trace_ids:
+                        # Create output directory based on components
+                        if components:
+                            start_str = start_time.strftime('%Y%m%d%H%M%S')
+                            # Use components from data.json
+                            for i, component in enumerate(components):
+                                out_dir = out_dirs[i]
                             
-                            # Create output directory and emit signal
-                            out_dir = self.create_output_directory(out_dir)
+                                # Create output directory and emit signal, once per group
+                                if i not in created_dirs:
+                                    self.create_output_directory(out_dir)
+                                    created_dirs.add(i)
                             
-                            # Create output filename
-                            out_file = out_dir / f"{parsed_parts['Station']}.{component}.{start_time.strftime('%Y%m%d%H%M%S')}.{self.file_format.lower()}"
+                                # Create output filename
+                                out_file = out_dir / f"{station}.{component}.{start_str}.{extension}"
                             
-                            # Write component data
-                            writer_class = self.plugin_manager.get_reader(self.file_format)
-                            if not writer_class:
-                                raise ValueError(f"No writer found for format: {self.file_format}")
-                            writer = writer_class()
-                            writer.write(str(out_file), output_stream[i])
+                                # Write component data; the buffer already spans the segment
+                                # with gaps set to zero, so no trim or padding is needed
+                                trace = Trace(data=buffers[trace_ids[i]], header=headers[trace_ids[i]])
+                                writer.write(str(out_file), trace)
+                                del trace
+                                
+                    spare_buffers.update(buffers)
                         
                 
-                # Update progress
-                self.progress.emit(int(current_index / total_files * 100))
-                
-            except Exception as e:
-                logger.error(f"Error processing file {files[current_index]}: {e}")
-                current_index += 1
-                self.progress.emit(int(current_index / total_files * 100))
+                except Exception as e:
+                    logger.error(f"Error processing file {files[current_index]}: {e}")
+                    current_index += 1
+                    self._advance_progress()
+        finally:
+            read_ahead.close()
 
     def cancel(self):
         """Cancel the processing."""
@@ -346,7 +533,8 @@ class MergeFilesDialog(BaseToolDialog):
         self.worker = FileMergeWorker()
         
         # Set worker parameters
-        self.worker.file_list = selected_files
+        # Absolute path strings, joined once for every read in the worker
+        self.worker.file_list = [os.path.join(self.project_dir, filename) for filename in selected_files]
         self.worker.merged_length = self.merged_length.value() * 3600  # Convert hours to seconds
         self.worker.zero_padded_percent = self.zero_padded_percent.value()
         self.worker.project_dir = self.project_dir
@@ -374,7 +562,7 @@ class MergeFilesDialog(BaseToolDialog):
         self.worker.finished.connect(self.worker.deleteLater)
         self.thread.finished.connect(self.thread.deleteLater)
         self.thread.finished.connect(self._on_processing_finished)
-        self.worker.error.connect(self._show_error)
+        self.worker.error.connect(self._show_errors)
         
         # Disable UI
         self.start_button.setEnabled(False)
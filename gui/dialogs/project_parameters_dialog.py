@@ -7,11 +7,21 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                            QMessageBox, QFileDialog, QCheckBox, QSpinBox,
                            QDoubleSpinBox, QTabWidget, QWidget, QGridLayout,
                            QTextEdit)
-from PyQt5.QtCore import Qt, pyqtSignal
-import json
+from PyQt5.QtCore import (Qt, QObject, QRunnable, QSignalBlocker, QThreadPool,
+                          QTimer, pyqtSignal)
+import copy
+import hashlib
+import importlib
+import io
+import mmap
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 import logging
 import os
+import numpy as np
 from utils.config import config
 from core.plugin_manager import PluginManager
 from utils.file_name_parser import FileNameParser
@@ -24,12 +34,296 @@ logger = logging.getLogger(__name__)
 DEFAULT_COMPONENT_NAMES = "N,E,Z"
 DEFAULT_NAME_MAPPING = "Network:1;Station:2;Location:3;Channel:4"
 
+# data.json is parsed and written with orjson when it is installed
+try:
+    import orjson
+    
+    def _loads(data: bytes):
+        return orjson.loads(data)
+        
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+    
+    def _loads(data: bytes):
+        return json.loads(data)
+        
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+# Section headers of a SAC .pz response file, e.g. "POLES 4"
+_PZ_HEADER_RE = re.compile(rb'^[ \t]*(ZEROS|POLES|CONSTANT)[ \t]+(\S+)[^\n]*$', re.MULTILINE)
+
+def _parse_pz(content) -> tuple:
+    """Parse the contents of a SAC .pz response file.
+    
+    Args:
+        content: Raw file contents (bytes or a memory map)
+        
+    Returns:
+        Tuple of zeros (complex array), poles (complex array) and the
+        constant (float, or None if the file has none)
+    """
+    zeros = np.empty(0, dtype=np.complex128)
+    poles = np.empty(0, dtype=np.complex128)
+    constant = None
+    
+    headers = list(_PZ_HEADER_RE.finditer(content))
+    for index, header in enumerate(headers):
+        section, value = header.groups()
+        if section == b'CONSTANT':
+            constant = float(value)
+            continue
+            
+        count = int(value)
+        if count == 0:
+            if section == b'ZEROS':
+                zeros = np.zeros(1, dtype=np.complex128)  # Default zero
+            continue
+            
+        # Numeric block up to the next section header, one "real imag" pair per line
+        end = headers[index + 1].start() if index + 1 < len(headers) else len(content)
+        block = content[header.end():end]
+        pairs = np.loadtxt(io.BytesIO(block), dtype=np.float64, comments='*',
+                           ndmin=2, max_rows=count).reshape(-1, 2)
+        values = pairs[:, 0] + 1j * pairs[:, 1]
+        if section == b'ZEROS':
+            zeros = values
+        else:
+            poles = values
+            
+    return zeros, poles, constant
+
+def _read_pz(file_path: str) -> tuple:
+    """Parse a SAC .pz response file in place through a read-only memory map.
+    
+    Args:
+        file_path: Path to the .pz file
+        
+    Returns:
+        Same as _parse_pz
+    """
+    with open(file_path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty files cannot be mapped
+            return _parse_pz(b'')
+        with mm:
+            return _parse_pz(mm)
+
+# Numbers written as complex(real, imag) or complex(real)
+_FLOAT = r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?'
+_COMPLEX_CALL_RE = re.compile(rf'complex\(\s*({_FLOAT})\s*(?:,\s*({_FLOAT})\s*)?\)')
+
+def _split_list_items(text: str) -> list:
+    """Split a list literal such as "[1, complex(2, 3)]" into its item texts.
+    
+    Args:
+        text: List literal text, with or without the brackets
+        
+    Returns:
+        List of stripped item texts; a trailing comma adds no item
+    """
+    body = text.strip()
+    if body.startswith('[') and body.endswith(']'):
+        body = body[1:-1]
+    if not body.strip():
+        return []
+        
+    # Commas inside parentheses, e.g. complex(1, 2), do not separate items
+    items = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(body):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            items.append(body[start:index].strip())
+            start = index + 1
+    last = body[start:].strip()
+    if last:
+        items.append(last)
+    return items
+
+def _parse_complex_list(text: str) -> list:
+    """Parse the numbers of a list literal such as "[(1+2j), -0.5-3j, -5]".
+    
+    Items may be complex literals with or without parentheses, plain reals
+    or complex(real, imag) calls.
+    
+    Args:
+        text: List literal text
+        
+    Returns:
+        List of [real, imag] pairs
+        
+    Raises:
+        ValueError: If an item is not a number
+    """
+    values = []
+    for item in _split_list_items(text):
+        match = _COMPLEX_CALL_RE.fullmatch(item)
+        try:
+            if match:
+                value = complex(float(match.group(1)), float(match.group(2) or 0))
+            else:
+                # complex() accepts "(a+bj)", "a+bj", "bj" and "a" without blanks
+                value = complex(item.replace(' ', ''))
+        except ValueError:
+            raise ValueError(f"Invalid complex number: {item!r}") from None
+        values.append([value.real, value.imag])
+    return values
+
+# Real literals, e.g. "1", "-2.5" or "3e-4"
+_NUM_RE = re.compile(_FLOAT)
+
+def _parse_float_list(text: str) -> list:
+    """Parse the numbers of a list literal such as "[1, -2.5, 3e-4]".
+    
+    Args:
+        text: List literal text
+        
+    Returns:
+        List of floats
+        
+    Raises:
+        ValueError: If an item is not a real number
+    """
+    values = []
+    for item in _split_list_items(text):
+        if not _NUM_RE.fullmatch(item):
+            raise ValueError(f"Invalid number: {item!r}")
+        values.append(float(item))
+    return values
+
+# "name = [...]" lines of the poles/zeros and transfer function fields
+_PZ_RE = re.compile(r'^[ \t]*(poles|zeros)[ \t]*=(.*)$', re.MULTILINE)
+_TF_RE = re.compile(r'^[ \t]*(numerator|denominator)[ \t]*=(.*)$', re.MULTILINE)
+
+def _format_complex_list(values: np.ndarray) -> str:
+    """Format a complex array as a Python list literal, e.g. "[(1+2j), 0j]"."""
+    return f"[{', '.join(map(repr, values.tolist()))}]"
+
+def _write_atomic(path: Path, payload: bytes):
+    """Write a file through a synced temporary sibling and an atomic rename.
+    
+    The previous contents stay intact until the new ones are complete.
+    
+    Args:
+        path: Target file path
+        payload: File contents
+    """
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+# Sorted format names of the available readers, filled on first use
+_CACHED_FORMATS = None
+
+@lru_cache(maxsize=None)
+def _shared_plugin_manager() -> PluginManager:
+    """Get the plugin manager shared by parameter dialogs, loading plugins once."""
+    return PluginManager()
+
+@lru_cache(maxsize=None)
+def _prewarm_executor() -> ThreadPoolExecutor:
+    """Get the background thread that imports format modules ahead of a file test."""
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix='format-prewarm')
+
+def _import_format_module(format_type: str):
+    """Import obspy's module for a format, which obspy otherwise loads on the first read.
+    
+    Args:
+        format_type: Format name
+    """
+    try:
+        importlib.import_module(f'obspy.io.{format_type.lower()}.core')
+    except ImportError:
+        pass  # Not an obspy format; its plugin reads it on its own
+
+@lru_cache(maxsize=32)
+def _get_parser(delimiters: str, parts_info: str, name_info: str) -> FileNameParser:
+    """Get a file name parser for the given rules, reused across tests."""
+    return FileNameParser(
+        delimiters=delimiters,
+        parts_info=parts_info,
+        name_info=name_info
+    )
+
+@lru_cache(maxsize=16)
+def _read_header_summary(reader_class, filepath: str, mtime_ns: int) -> tuple:
+    """Read the header fields shown by a file test, reused for repeated tests.
+    
+    Keyed on the reader class rather than an instance, so entries are shared
+    between dialogs and do not keep readers alive.
+    
+    Args:
+        reader_class: Reader class for the file format
+        filepath: File path
+        mtime_ns: File modification time, so edited files are read again
+        
+    Returns:
+        Tuple of (start time, sampling rate, trace number), or None if the
+        file has no traces
+    """
+    header = reader_class().read_header(filepath)
+    if not header:
+        return None
+    return header[0].stats.starttime, header[0].stats.sampling_rate, len(header)
+
+class _SaveSignals(QObject):
+    """Signals of a background data.json save."""
+    
+    finished = pyqtSignal()  # Outcome is in the runnable's error
+    
+class _SaveRunnable(QRunnable):
+    """Runnable writing data.json on the global thread pool."""
+    
+    def __init__(self, path: Path, payload: bytes):
+        """Initialize runnable.
+        
+        Args:
+            path: data.json path
+            payload: Serialized parameters
+        """
+        super().__init__()
+        # Kept by the dialog, which may wait for it when closing
+        self.setAutoDelete(False)
+        self.path = path
+        self.payload = payload
+        self.error = None  # Error message if the write failed
+        self.written = threading.Event()  # Set once the write has ended
+        self.signals = _SaveSignals()
+        
+    def run(self):
+        """Write the file and report the outcome."""
+        try:
+            _write_atomic(self.path, self.payload)
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self.written.set()
+            self.signals.finished.emit()
+
 class ProjectParametersDialog(QDialog):
     """Dialog for setting project parameters."""
     
     # Add signal for parameters saved
     parameters_saved = pyqtSignal(str)  # Signal to emit the new output folder path
     
+    # Parsed data.json files keyed by (path, mtime in ns), shared by all dialogs
+    _json_cache = {}
+    
     def __init__(self, project_dir: str, parent=None):
         """Initialize dialog.
         
@@ -43,14 +337,27 @@ class ProjectParametersDialog(QDialog):
         # Test file result
         self.testfile_result = False
         self.trace_num = 1  # Initialize trace_num with default value
+        self._loaded_data = {}  # data.json contents, for tabs built later
+        # Parsed (text, poles, zeros) and (text, transfer function) of the
+        # response fields, so unchanged text is not parsed again on save
+        self._pz_cache = (None, None, None)
+        self._tf_cache = (None, None)
+        self._reader_cache = {}  # Reader instances by upper-case format name
+        self._last_saved_digest = None  # Digest of the last data.json written
+        self._project_dir_ensured = False  # Project directory created by a save
+        self._pending_save = None  # (data, digest, output folder) being written
+        self._encoded_sections = {}  # Top-level key -> (value, encoded value) of the last save
+        self._save_runnable = None  # Save being written, until its outcome is handled
         
-        # Initialize plugin manager for format list
-        self.plugin_manager = PluginManager()
+        # Plugin manager for format list, shared so plugins are scanned once
+        self.plugin_manager = _shared_plugin_manager()
         
         self._init_ui()
         self._load_parameters()
-
         
+        # Import the selected format's obspy module while the user reviews the dialog
+        QTimer.singleShot(0, self._prewarm_reader)
+        self.data_format.currentIndexChanged.connect(lambda _index: self._prewarm_reader())
         
     def _init_ui(self):
         """Initialize UI components."""
@@ -62,11 +369,44 @@ class ProjectParametersDialog(QDialog):
         
         layout = QVBoxLayout()
         
-        # Create tab widget
-        tab_widget = QTabWidget()
-        
-        # Data Parameters Tab
+        # Create tab widget; the Instrument and Plot tabs are built when first shown
+        self.tab_widget = QTabWidget()
         data_tab = QWidget()
+        self._build_data_tab(data_tab)
+        self.tab_widget.addTab(data_tab, "Data Parameters")
+        tool_tab = QWidget()
+        self._build_tool_tab(tool_tab)
+        self.tab_widget.addTab(tool_tab, "Tool Parameters")
+        self._lazy_tabs = {
+            self.tab_widget.addTab(QWidget(), "Instrument Parameters"):
+                (self._build_instrument_tab, self._load_instrument_params),
+            self.tab_widget.addTab(QWidget(), "Plot Parameters"):
+                (self._build_plot_tab, self._load_plot_params),
+        }
+        self._built_tabs = set()
+        self.tab_widget.currentChanged.connect(self._ensure_tab_built)
+        
+        layout.addWidget(self.tab_widget)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        self.save_button = QPushButton("Save")
+        self.save_button.clicked.connect(self.save_parameters)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        
+        button_layout.addWidget(self.save_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+        
+        self.setLayout(layout)
+        
+    def _build_data_tab(self, data_tab: QWidget):
+        """Build the Data Parameters tab.
+        
+        Args:
+            data_tab: Tab widget to fill
+        """
         data_layout = QVBoxLayout()
         
         # File format group
@@ -158,10 +498,13 @@ class ProjectParametersDialog(QDialog):
         
         
         data_tab.setLayout(data_layout)
-        tab_widget.addTab(data_tab, "Data Parameters")
         
-        # Tool Parameters Tab
-        tool_tab = QWidget()
+    def _build_tool_tab(self, tool_tab: QWidget):
+        """Build the Tool Parameters tab.
+        
+        Args:
+            tool_tab: Tab widget to fill
+        """
         tool_layout = QVBoxLayout()
         
         # Output format group
@@ -235,10 +578,13 @@ class ProjectParametersDialog(QDialog):
         tool_layout.addWidget(start_hour_group)
         
         tool_tab.setLayout(tool_layout)
-        tab_widget.addTab(tool_tab, "Tool Parameters")
         
-        # Instrument Parameters Tab
-        instrument_tab = QWidget()
+    def _build_instrument_tab(self, instrument_tab: QWidget):
+        """Build the Instrument Parameters tab.
+        
+        Args:
+            instrument_tab: Tab widget to fill
+        """
         instrument_layout = QVBoxLayout()
         
         # Instrument response group
@@ -329,10 +675,13 @@ class ProjectParametersDialog(QDialog):
         instrument_layout.addWidget(instrument_params_group)
         
         instrument_tab.setLayout(instrument_layout)
-        tab_widget.addTab(instrument_tab, "Instrument Parameters")
         
-        # Plot Parameters Tab
-        plot_tab = QWidget()
+    def _build_plot_tab(self, plot_tab: QWidget):
+        """Build the Plot Parameters tab.
+        
+        Args:
+            plot_tab: Tab widget to fill
+        """
         plot_layout = QVBoxLayout()
         
         # Plot settings group
@@ -371,23 +720,69 @@ class ProjectParametersDialog(QDialog):
         plot_layout.addStretch()
         
         plot_tab.setLayout(plot_layout)
-        tab_widget.addTab(plot_tab, "Plot Parameters")
         
-        layout.addWidget(tab_widget)
+    def _ensure_tab_built(self, index: int):
+        """Build a lazily created tab and load its parameters the first time it is shown.
         
-        # Buttons
-        button_layout = QHBoxLayout()
-        save_button = QPushButton("Save")
-        save_button.clicked.connect(self.save_parameters)
-        cancel_button = QPushButton("Cancel")
-        cancel_button.clicked.connect(self.reject)
+        Args:
+            index: Tab index
+        """
+        if index not in self._lazy_tabs or index in self._built_tabs:
+            return
+        self._built_tabs.add(index)
+        build, load = self._lazy_tabs[index]
+        tab = self.tab_widget.widget(index)
+        tab.setUpdatesEnabled(False)
+        try:
+            build(tab)
+            load(self._loaded_data)
+        except Exception as e:
+            logger.error(f"Error loading parameters: {e}")
+        finally:
+            tab.setUpdatesEnabled(True)
         
-        button_layout.addWidget(save_button)
-        button_layout.addWidget(cancel_button)
-        layout.addLayout(button_layout)
+    def _ensure_all_tabs_built(self):
+        """Build every lazily created tab, e.g. before reading all fields to save."""
+        for index in self._lazy_tabs:
+            self._ensure_tab_built(index)
         
-        self.setLayout(layout)
+    @classmethod
+    def invalidate_format_cache(cls):
+        """Rescan plugins and formats the next time a dialog is opened."""
+        global _CACHED_FORMATS
+        _CACHED_FORMATS = None
+        _shared_plugin_manager.cache_clear()
+        
+    @classmethod
+    def _load_json_cached(cls, path: Path) -> dict:
+        """Load a JSON file, reusing the parsed result while the file is unchanged.
+        
+        Args:
+            path: JSON file path
+            
+        Returns:
+            Copy of the parsed data, safe to modify
+        """
+        key = (str(path), path.stat().st_mtime_ns)
+        data = cls._json_cache.get(key)
+        if data is None:
+            data = _loads(path.read_bytes())
+            # Drop entries of older versions of this file
+            for old_key in [k for k in cls._json_cache if k[0] == key[0]]:
+                del cls._json_cache[old_key]
+            cls._json_cache[key] = data
+        return copy.deepcopy(data)
+        
+    @classmethod
+    def _invalidate_json_cache(cls, path: Path):
+        """Forget cached contents of a JSON file.
         
+        Args:
+            path: JSON file path
+        """
+        for key in [k for k in cls._json_cache if k[0] == str(path)]:
+            del cls._json_cache[key]
+            
     def _open_file(self):
         """Open file selection dialog."""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -409,11 +804,11 @@ class ProjectParametersDialog(QDialog):
         filename = Path(filepath).name
             
         try:
-            # Create parser with current UI values
-            parser = FileNameParser(
-                delimiters=self.delimiters.text().strip(),
-                parts_info=self.parts_info.text().strip(),
-                name_info=self.name_info.toPlainText().strip()
+            # Get parser for current UI values
+            parser = _get_parser(
+                self.delimiters.text().strip(),
+                self.parts_info.text().strip(),
+                self.name_info.toPlainText().strip()
             )
             
             # Parse filename
@@ -425,61 +820,62 @@ class ProjectParametersDialog(QDialog):
                 # Get format from last part of pattern
                 format_type = self.data_format.currentText()
                 
-                # Create success message
-                message = (
-                    f"Success! The filename matches the pattern.\n\n"
-                    f"Filename: {filename}\n"
-                    f"Delimiters: {self.delimiters.text().strip()}\n"
-                    f"Pattern parts: {self.parts_info.text().strip().split()}\n"
-                    f"Parts found: {list(parsed_parts.values())}\n"
-                    f"File format (Actual format): {format_type}\n\n"
-                    f"Part meanings:"
-                )
+                # Create success message, collected as lines and joined once
+                lines = [
+                    "Success! The filename matches the pattern.",
+                    "",
+                    f"Filename: {filename}",
+                    f"Delimiters: {self.delimiters.text().strip()}",
+                    f"Pattern parts: {self.parts_info.text().strip().split()}",
+                    f"Parts found: {list(parsed_parts.values())}",
+                    f"File format (Actual format): {format_type}",
+                    "",
+                    "Part meanings:"
+                ]
                 
                 # Add meaning of each part
-                for i, (code_type, value) in enumerate(parsed_parts.items()):
-                    message += f"\n{i+1}. {code_type}: {value}"
+                lines.extend(f"{i+1}. {code_type}: {value}"
+                             for i, (code_type, value) in enumerate(parsed_parts.items()))
                 
                 # Get name info string and folder architecture
                 name_info_str = parser.get_name_info_string(parsed_parts)
                 folder_arch = parser.get_folder_architecture(parsed_parts)
                 
                 # Add name info and folder architecture to message
-                message += "\n\nName Information:"
-                message += f"\n{name_info_str}"
-                message += "\n\nFolder Architecture:"
-                message += f"\n{folder_arch}"
+                lines.extend(["", "Name Information:", name_info_str,
+                              "", "Folder Architecture:", folder_arch])
                 
                 # Try to read file header
                 try:
                     # Get reader for the format
-                    reader_class = self.plugin_manager.get_reader(format_type.upper())
-                    if reader_class:
-                        reader = reader_class()
+                    reader = self._get_reader_for(format_type)
+                    if reader:
                         # Read header using the reader
-                        header = reader.read_header(filepath)
+                        summary = _read_header_summary(
+                            type(reader), filepath, os.stat(filepath).st_mtime_ns)
                          
-                        if header:
-                            self.trace_num = header.__len__()
-                            message += "\n\nFile Header Information:"
-                            message += f"\nStart Time: {header[0].stats.starttime}"
-                            message += f"\nSampling Rate: {header[0].stats.sampling_rate} Hz"
-                            message += f"\nTrace number: {header.__len__()}"
+                        if summary:
+                            starttime, sampling_rate, trace_num = summary
+                            self.trace_num = trace_num
+                            lines.extend(["", "File Header Information:",
+                                          f"Start Time: {starttime}",
+                                          f"Sampling Rate: {sampling_rate} Hz",
+                                          f"Trace number: {trace_num}"])
                             # Single trace file, but no channel info in file name
-                            if self.trace_num == 1 and not channel:
-                                show_message=f"\nWarning!!!Trace number: {self.trace_num},"\
+                            if trace_num == 1 and not channel:
+                                show_message=f"Warning!!!Trace number: {trace_num},"\
                                   "but no channel info in filename."\
                                   "Please set a channel code."
-                                message += show_message
-                                QMessageBox.critical(self, "Warning", show_message)
+                                lines.append(show_message)
+                                QMessageBox.critical(self, "Warning", f"\n{show_message}")
 
                     else:
-                        message += f"\n\nWarning: No reader found for format {format_type}"
+                        lines.extend(["", f"Warning: No reader found for format {format_type}"])
                 except Exception as e:
-                    message += f"\n\nError reading file header: {str(e)}"
+                    lines.extend(["", f"Error reading file header: {str(e)}"])
                 
                 # Show message in textbox
-                self.file_info.setPlainText(message)
+                self.file_info.setPlainText("\n".join(lines))
             else:
                 self.testfile_result=False
                 # Create failure message
@@ -496,6 +892,32 @@ class ProjectParametersDialog(QDialog):
             logger.error(f"Error testing filename: {e}")
             self.file_info.setPlainText(f"Error testing filename: {str(e)}")
             
+    def _get_reader_for(self, format_type: str):
+        """Get a reader instance for a format, reused across tests.
+        
+        Args:
+            format_type: Format name
+            
+        Returns:
+            Reader instance, or None if no plugin handles the format
+        """
+        key = format_type.upper()
+        if key not in self._reader_cache:
+            reader_class = self.plugin_manager.get_reader(key)
+            self._reader_cache[key] = reader_class() if reader_class else None
+        return self._reader_cache[key]
+        
+    def _prewarm_reader(self):
+        """Import the obspy module of the selected data format in the background.
+        
+        obspy loads a format's module on the first read of that format, which
+        would otherwise block the first file test. Readers are still created
+        on the GUI thread by _get_reader_for.
+        """
+        format_type = self.data_format.currentText()
+        if format_type:
+            _prewarm_executor().submit(_import_format_module, format_type)
+            
     def _on_downsample_changed(self, state):
         """Handle downsampling checkbox state change."""
         self.chunk_size_spinner.setEnabled(state == Qt.Checked)
@@ -522,52 +944,20 @@ class ProjectParametersDialog(QDialog):
             return
             
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-                
             # Parse .pz file
-            poles = []
-            zeros = []
-            constant = None
-            
-            current_section = None
-            count = 0
-            remaining_count = 0
-            
-            for line in content.split('\n'):
-                line = line.strip()
-                if not line:
-                    continue
+            zeros, poles, constant = _read_pz(file_path)
                     
-                if line.startswith('ZEROS'):
-                    current_section = 'ZEROS'
-                    count = int(line.split()[1])
-                    remaining_count = count
-                    if count == 0:
-                        zeros = [complex(0, 0)]  # Default zero
-                        current_section = None
-                elif line.startswith('POLES'):
-                    current_section = 'POLES'
-                    count = int(line.split()[1])
-                    remaining_count = count
-                elif line.startswith('CONSTANT'):
-                    current_section = None
-                    constant = float(line.split()[1])
-                elif current_section == 'ZEROS' and remaining_count > 0:
-                    # Parse complex number
-                    real, imag = map(float, line.split())
-                    zeros.append(complex(real, imag))
-                    remaining_count -= 1
-                elif current_section == 'POLES' and remaining_count > 0:
-                    # Parse complex number
-                    real, imag = map(float, line.split())
-                    poles.append(complex(real, imag))
-                    remaining_count -= 1
-                    
-            # Update UI
-            self.poles_zeros_edit.setPlainText(
-                f"poles = {poles}\n"
-                f"zeros = {zeros}"
+            # Update UI; the values are kept so saving this text needs no reparsing
+            text = (
+                f"poles = {_format_complex_list(poles)}\n"
+                f"zeros = {_format_complex_list(zeros)}"
+            )
+            self.poles_zeros_edit.setPlainText(text)
+            # A complex128 array viewed as float64 is its [real, imag] pairs
+            self._pz_cache = (
+                text,
+                poles.view(np.float64).reshape(-1, 2).tolist(),
+                zeros.view(np.float64).reshape(-1, 2).tolist()
             )
             self.response_type.setCurrentIndex(0)
             
@@ -596,27 +986,32 @@ class ProjectParametersDialog(QDialog):
 
     def _load_parameters(self):
         """Load parameters from data.json."""
+        # Populate widgets without per-change signals or repaints
+        self.setUpdatesEnabled(False)
+        blockers = [QSignalBlocker(widget) for widget in (
+            self.data_format, self.output_format, self.delimiters, self.parts_info,
+            self.name_info, self.output_folder, self.component_name, self.start_on_hour)]
+        # Default output folder as complete path
+        default_output = str(Path(self.project_dir, DEFAULT_OUTPUT_FOLDER))
         try:
-            # Load available formats from plugin manager
-            readers = self.plugin_manager.get_available_readers()
-            formats = sorted([fmt.strip('.').upper() for fmt in readers.keys() if fmt])
+            # Load available formats from plugin manager, once per session
+            global _CACHED_FORMATS
+            if _CACHED_FORMATS is None:
+                readers = self.plugin_manager.get_available_readers()
+                _CACHED_FORMATS = sorted({fmt.strip('.').upper() for fmt in readers if fmt})
             self.data_format.clear()
             self.output_format.clear()
-            self.data_format.addItems(formats)
-            self.output_format.addItems(formats)
+            self.data_format.addItems(_CACHED_FORMATS)
+            self.output_format.addItems(_CACHED_FORMATS)
             
-            # Check if data.json exists
-            if not self.data_json_path.exists():
+            # Load data.json
+            try:
+                data = self._load_json_cached(self.data_json_path)
+            except FileNotFoundError:
                 logger.info(f"data.json not found at {self.data_json_path}, will create new one on save")
-                # Set default output folder as complete path
-                default_output = str(Path(self.project_dir) / DEFAULT_OUTPUT_FOLDER)
                 self.output_folder.setText(default_output)
                 return
                 
-            # Load data.json
-            with open(self.data_json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
             # Load parameters
             if 'name_parser' in data:
                 parser = data['name_parser']
@@ -641,43 +1036,15 @@ class ProjectParametersDialog(QDialog):
                     self.output_format.setCurrentIndex(index)
                 
                 # Load output folder, use complete path for default
-                default_output = str(Path(self.project_dir) / DEFAULT_OUTPUT_FOLDER)
                 self.output_folder.setText(params.get('outputFolder', default_output))
                 
                 self.component_name.setText(params.get('componentName', DEFAULT_COMPONENT_NAMES))
                 self.start_on_hour.setChecked(params.get('startOnHour', False))
                 
-                # Load instrument parameters
-                self.sensitivity.setText(str(params.get('wholeSensitivity', '')))
-                
-                # Set instrument type
-                instrument_type = params.get('instrumentTpye', 0)
-                self.sens_unit.setCurrentIndex(instrument_type)
-                
-                # Load response parameters
-                self.response_type.setCurrentIndex(params.get('responseType', 0))
-                self.damping.setText(str(params.get('damp', '')))
-                self.natural_period.setText(str(params.get('naturalPeriod', '')))
-                
-                # Load poles and zeros if available
-                if 'poles' in params and 'zeros' in params:
-                    poles_str = ';'.join([str(p) for p in params['poles']])
-                    zeros_str = ';'.join([str(z) for z in params['zeros']])
-                    self.poles_zeros_edit.setPlainText(f"poles = {poles_str}\nzeros = {zeros_str}")
-                    
-                # Load transfer function if available
-                if 'transfer_function' in params:
-                    tf = params['transfer_function']
-                    if 'numerator' in tf and 'denominator' in tf:
-                        num_str = ';'.join([str(n) for n in tf['numerator']])
-                        den_str = ';'.join([str(d) for d in tf['denominator']])
-                        self.transfer_function_edit.setPlainText(f"numerator = {num_str}\ndenominator = {den_str}")
-                
-                # Load plot parameters
-                if 'plot_params' in data:
-                    plot_params = data['plot_params']
-                    self.enable_downsampling.setChecked(plot_params.get('enable_downsampling', True))
-                    self.chunk_size_spinner.setValue(plot_params.get('chunk_size', 10000))
+            # Instrument and plot parameters are loaded when their tabs are built
+            self._loaded_data = data
+            for index in self._built_tabs:
+                self._lazy_tabs[index][1](data)
                 
         except Exception as e:
             logger.error(f"Error loading parameters: {e}")
@@ -686,131 +1053,253 @@ class ProjectParametersDialog(QDialog):
                 "Warning",
                 f"Failed to load parameters: {str(e)}"
             )
+        finally:
+            for blocker in blockers:
+                blocker.unblock()
+            self.setUpdatesEnabled(True)
+            
+    def _load_instrument_params(self, data: dict):
+        """Load the Instrument Parameters tab fields.
+        
+        Args:
+            data: Parsed data.json contents
+        """
+        if 'data_params' not in data:
+            return
+        params = data['data_params']
+        
+        # Load instrument parameters
+        self.sensitivity.setText(str(params.get('wholeSensitivity', '')))
+        
+        # Set instrument type
+        instrument_type = params.get('instrumentTpye', 0)
+        self.sens_unit.setCurrentIndex(instrument_type)
+        
+        # Load response parameters
+        self.response_type.setCurrentIndex(params.get('responseType', 0))
+        self.damping.setText(str(params.get('damp', '')))
+        self.natural_period.setText(str(params.get('naturalPeriod', '')))
+        
+        # Load poles and zeros if available
+        if 'poles' in params and 'zeros' in params:
+            # Stored as [real, imag] pairs, shown in the same form a .pz file loads to
+            poles = np.array([complex(*p) for p in params['poles']], dtype=np.complex128)
+            zeros = np.array([complex(*z) for z in params['zeros']], dtype=np.complex128)
+            self.poles_zeros_edit.setPlainText(
+                f"poles = {_format_complex_list(poles)}\n"
+                f"zeros = {_format_complex_list(zeros)}"
+            )
+            
+        # Load transfer function if available
+        if 'transfer_function' in params:
+            tf = params['transfer_function']
+            if 'numerator' in tf and 'denominator' in tf:
+                # Shown as list literals, the form saving parses back
+                num_str = f"[{', '.join(map(repr, tf['numerator']))}]"
+                den_str = f"[{', '.join(map(repr, tf['denominator']))}]"
+                self.transfer_function_edit.setPlainText(f"numerator = {num_str}\ndenominator = {den_str}")
+                
+    def _load_plot_params(self, data: dict):
+        """Load the Plot Parameters tab fields.
+        
+        Args:
+            data: Parsed data.json contents
+        """
+        if 'plot_params' in data:
+            plot_params = data['plot_params']
+            self.enable_downsampling.setChecked(plot_params.get('enable_downsampling', True))
+            self.chunk_size_spinner.setValue(plot_params.get('chunk_size', 10000))
             
     def save_parameters(self):
         """Save parameters to data.json."""
         try:
-            # Load existing data if available
-            existing_data = {}
-            if os.path.exists(self.data_json_path):
-                try:
-                    with open(self.data_json_path, 'r', encoding='utf-8') as f:
-                        existing_data = json.load(f)
-                except Exception as e:
-                    logger.warning(f"Could not load existing data.json: {e}")
+            # Every field is saved, so tabs not opened yet need their values
+            self._ensure_all_tabs_built()
+            
+            # Existing data was already parsed when the dialog loaded
+            existing_data = self._loaded_data
+            
+            # Read every field once up front
+            output_folder_text = self.output_folder.text()
+            poles_zeros_text = self.poles_zeros_edit.toPlainText()
+            tf_text = self.transfer_function_edit.toPlainText()
+            # Fields holding only blank lines are treated as empty
+            if poles_zeros_text.isspace():
+                poles_zeros_text = ''
+            if tf_text.isspace():
+                tf_text = ''
+            name_parser = {
+                'delimiters': self.delimiters.text().strip(),
+                'parts_info': self.parts_info.text().strip(),
+                'name_info': self.name_info.toPlainText().strip()
+            }
+            data_params = {
+                'dataFormat': self.data_format.currentText().lower(),
+                'outputFormat': self.output_format.currentText().lower(),
+                'outputFolder': output_folder_text,
+                'traceNum': self.trace_num,
+                'componentName': self.component_name.text(),
+                'startOnHour': self.start_on_hour.isChecked(),
+                'instrumentTpye': self.sens_unit.currentIndex(),
+                'naturalPeriod': self.natural_period.text(),
+                'wholeSensitivity': self.sensitivity.text(),
+                'damp': self.damping.text()
+            }
+            plot_params = {
+                'enable_downsampling': self.enable_downsampling.isChecked(),
+                'chunk_size': self.chunk_size_spinner.value()
+            }
             
             # Ensure output folder is absolute path
-            output_folder = self.output_folder.text().strip()
+            output_folder = output_folder_text.strip()
             if not os.path.isabs(output_folder):
                 output_folder = str(Path(self.project_dir) / output_folder)
             
             # Prepare new data
             data = {
-                'name_parser': {
-                    'delimiters': self.delimiters.text().strip(),
-                    'parts_info': self.parts_info.text().strip(),
-                    'name_info': self.name_info.toPlainText().strip()
-                },
+                'name_parser': name_parser,
                 'test_result': self.testfile_result,
-                'data_params': {
-                    'dataFormat': self.data_format.currentText().lower(),
-                    'outputFormat': self.output_format.currentText().lower(),
-                    'outputFolder': self.output_folder.text(),
-                    'traceNum': self.trace_num,
-                    'componentName': self.component_name.text(),
-                    'startOnHour': self.start_on_hour.isChecked(),
-                    'instrumentTpye': self.sens_unit.currentIndex(),
-                    'naturalPeriod': self.natural_period.text(),
-                    'wholeSensitivity': self.sensitivity.text(),
-                    'damp': self.damping.text()
-                },
-                'plot_params': {
-                    'enable_downsampling': self.enable_downsampling.isChecked(),
-                    'chunk_size': self.chunk_size_spinner.value()
-                }
+                'data_params': data_params,
+                'plot_params': plot_params
             }
             
             # Parse poles and zeros if provided
-            poles_zeros_text = self.poles_zeros_edit.toPlainText()
-            if poles_zeros_text:
+            if poles_zeros_text and poles_zeros_text != self._pz_cache[0]:
                 try:
-                    # Simple parsing of poles and zeros
-                    poles = []
-                    zeros = []
-                    for line in poles_zeros_text.split('\n'):
-                        line = line.strip()
-                        if line.startswith('poles ='):
-                            # Convert complex numbers to string representation
-                            poles_str = line.split('=', 1)[1].strip()
-                            poles = eval(poles_str)
-                            # Convert complex numbers to list of [real, imag] pairs
-                            poles = [[p.real, p.imag] for p in poles]
-                        elif line.startswith('zeros ='):
-                            # Convert complex numbers to string representation
-                            zeros_str = line.split('=', 1)[1].strip()
-                            zeros = eval(zeros_str)
-                            # Convert complex numbers to list of [real, imag] pairs
-                            zeros = [[z.real, z.imag] for z in zeros]
-                    data['data_params']['poles'] = poles
-                    data['data_params']['zeros'] = zeros
+                    # Convert complex numbers to lists of [real, imag] pairs
+                    lists = {'poles': [], 'zeros': []}
+                    for match in _PZ_RE.finditer(poles_zeros_text):
+                        lists[match.group(1)] = _parse_complex_list(match.group(2))
+                    self._pz_cache = (poles_zeros_text, lists['poles'], lists['zeros'])
                 except Exception as e:
                     logger.warning(f"Could not parse poles and zeros: {e}")
+            if poles_zeros_text and poles_zeros_text == self._pz_cache[0]:
+                data_params['poles'] = self._pz_cache[1]
+                data_params['zeros'] = self._pz_cache[2]
                     
             # Parse transfer function if provided
-            tf_text = self.transfer_function_edit.toPlainText()
-            if tf_text:
+            if tf_text and tf_text != self._tf_cache[0]:
                 try:
-                    # Simple parsing of transfer function
-                    numerator = []
-                    denominator = []
-                    for line in tf_text.split('\n'):
-                        line = line.strip()
-                        if line.startswith('numerator ='):
-                            # Parse numerator coefficients
-                            num_str = line.split('=', 1)[1].strip()
-                            numerator = eval(num_str)
-                            # Ensure all coefficients are real numbers
-                            numerator = [float(n) for n in numerator]
-                        elif line.startswith('denominator ='):
-                            # Parse denominator coefficients
-                            den_str = line.split('=', 1)[1].strip()
-                            denominator = eval(den_str)
-                            # Ensure all coefficients are real numbers
-                            denominator = [float(d) for d in denominator]
-                    data['data_params']['transfer_function'] = {
-                        'numerator': numerator,
-                        'denominator': denominator
-                    }
+                    # Parse numerator and denominator coefficients
+                    transfer_function = {'numerator': [], 'denominator': []}
+                    for match in _TF_RE.finditer(tf_text):
+                        transfer_function[match.group(1)] = _parse_float_list(match.group(2))
+                    self._tf_cache = (tf_text, transfer_function)
                 except Exception as e:
                     logger.warning(f"Could not parse transfer function: {e}")
+            if tf_text and tf_text == self._tf_cache[0]:
+                data_params['transfer_function'] = self._tf_cache[1]
             
             # Preserve existing cut_params if they exist
             if 'cut_params' in existing_data:
                 data['cut_params'] = existing_data['cut_params']
             
-            # Create project directory if it doesn't exist
-            os.makedirs(self.project_dir, exist_ok=True)
-            
-            # Save the data
-            with open(self.data_json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4)
+            # Skip the write when this dialog already saved the same contents
+            payload = self._encode(data)
+            digest = hashlib.blake2b(payload, digest_size=16).digest()
+            if digest != self._last_saved_digest or not self.data_json_path.exists():
+                # Create project directory if it doesn't exist
+                if not self._project_dir_ensured:
+                    os.makedirs(self.project_dir, exist_ok=True)
+                    self._project_dir_ensured = True
                 
-            logger.info(f"Saved parameters to {self.data_json_path}")
+                # Write the data off the GUI thread; saving again waits for it
+                self._pending_save = (data, digest, output_folder)
+                runnable = _SaveRunnable(self.data_json_path, payload)
+                runnable.signals.finished.connect(self._complete_save)
+                self._save_runnable = runnable
+                self.save_button.setEnabled(False)
+                QThreadPool.globalInstance().start(runnable)
+                return
+                
+            logger.debug(f"Parameters unchanged, not rewriting {self.data_json_path}")
+            self._report_saved(output_folder)
             
-            # Emit signal with new output folder path
-            self.parameters_saved.emit(str(Path(output_folder).absolute()))
+        except Exception as e:
+            self._on_save_failed(str(e))
             
-            # Show success message without closing dialog
-            QMessageBox.information(
-                self,
-                "Success",
-                f"Parameters saved successfully to:\n{self.data_json_path}"
-            )
+    def _encode(self, data: dict) -> bytes:
+        """Serialize data.json contents, reusing sections unchanged since the last save.
+        
+        Args:
+            data: Parameters to save
             
-        except Exception as e:
-            logger.error(f"Error saving parameters: {e}")
-            QMessageBox.critical(
-                self,
-                "Error",
-                f"Failed to save parameters: {str(e)}"
-            ) 
\ No newline at end of file
+        Returns:
+            Compact JSON bytes, identical to _dumps(data)
+        """
+        parts = []
+        for key, value in data.items():
+            cached = self._encoded_sections.get(key)
+            if cached is None or cached[0] != value:
+                cached = (value, _dumps(value))
+                self._encoded_sections[key] = cached
+            parts.append(_dumps(key) + b':' + cached[1])
+        return b'{' + b','.join(parts) + b'}'
+        
+    def _complete_save(self):
+        """Handle the outcome of the background save, once."""
+        runnable = self._save_runnable
+        if runnable is None:
+            return  # Already handled when the dialog closed
+        self._save_runnable = None
+        if runnable.error is None:
+            self._on_save_finished()
+        else:
+            self._on_save_failed(runnable.error)
+            
+    def done(self, result):
+        """Close the dialog, first finishing a save that is still being written.
+        
+        The main window reads data.json as soon as the dialog returns.
+        
+        Args:
+            result: Dialog result code
+        """
+        if self._save_runnable is not None:
+            self._save_runnable.written.wait()
+            self._complete_save()
+        super().done(result)
+        
+    def _on_save_finished(self):
+        """Handle a completed background save."""
+        data, digest, output_folder = self._pending_save
+        self._pending_save = None
+        self.save_button.setEnabled(True)
+        
+        self._invalidate_json_cache(self.data_json_path)
+        self._loaded_data = data
+        self._last_saved_digest = digest
+        logger.info(f"Saved parameters to {self.data_json_path}")
+        self._report_saved(output_folder)
+        
+    def _on_save_failed(self, message: str):
+        """Handle a failed save.
+        
+        Args:
+            message: Error message
+        """
+        self._pending_save = None
+        self.save_button.setEnabled(True)
+        
+        logger.error(f"Error saving parameters: {message}")
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"Failed to save parameters: {message}"
+        )
+        
+    def _report_saved(self, output_folder: str):
+        """Announce saved parameters.
+        
+        Args:
+            output_folder: Output folder path
+        """
+        # Emit signal with new output folder path
+        self.parameters_saved.emit(os.path.abspath(output_folder))
+        
+        # Show success message without closing dialog
+        QMessageBox.information(
+            self,
+            "Success",
+            f"Parameters saved successfully to:\n{self.data_json_path}"
+        ) 
\ No newline at end of file
@@ -13,7 +13,10 @@ from PyQt5.QtCore import Qt, QThread, QObject, pyqtSignal, QDateTime, QTimer, QD
 import os
 from pathlib import Path
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
 import numpy as np
 import configparser
 import json
@@ -26,6 +29,104 @@ from utils.constants import DEFAULT_OUTPUT_FOLDER, PSD_FILE_SUFFIX, PSD_FOLDER_N
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def _available_readers() -> dict:
+    """Get the reader classes by file extension, loading plugins once per process."""
+    return PluginManager().get_available_readers()
+
+def _process_one(file_name: str, params: dict) -> str:
+    """Calculate and save the PSD of a single file.
+    
+    Runs in a worker process, so it only takes picklable arguments and
+    loads reader plugins itself.
+    
+    Args:
+        file_name: Path of the file to process
+        params: PSD parameters, as built by PSDProcessingWorker.get_params
+        
+    Returns:
+        Path of the saved PSD file
+    """
+    # Get file extension and reader
+    ext = Path(file_name).suffix.lower()
+    reader_class = _available_readers().get(ext)
+    if not reader_class:
+        raise ValueError(f"Unsupported file format: {ext}")
+        
+    reader = reader_class()
+    data = reader.read(file_name)
+    
+    # Check if data is an ObsPy Stream
+    if hasattr(data, 'traces') and len(data) > 0:
+        # Get the first trace's data
+        trace = data[0]
+        data_array = trace.data
+        sample_rate = trace.stats.sampling_rate
+    else:
+        raise ValueError("Invalid data format: expected ObsPy Stream with at least one trace")
+    
+    # Calculate PSD
+    calculator = PSDCalculator(
+        sample_rate=float(sample_rate),
+        sensitivity=float(params['sensitivity']),
+        instrument_type=params['instrument_type'],
+        damping_ratio=float(params['damping']),
+        natural_period=float(params['natural_period'])
+    )
+    
+    # Configure calculator
+    calculator.filter_enabled = params['filter_enabled']
+    calculator.response_removal_enabled = params['response_enabled']
+    
+    if calculator.filter_enabled:
+        calculator.filter_type = params['filter_type']
+        if calculator.filter_type == "High Pass":
+            calculator.cutoff_freq = params['filter_freq']
+        else:  # Band Pass
+            calculator.cutoff_freq = (params['low_freq'], params['high_freq'])
+            
+    # Configure window parameters
+    calculator.window_size = params['window_size']
+    calculator.overlap = params['overlap']
+    calculator.window_type = params['window_type']
+    
+    # Configure PSD frequency range
+    calculator.psd_freq_min = params['psd_freq_min']
+    calculator.psd_freq_max = params['psd_freq_max']
+    
+    # Calculate PSD and smoothed PSD
+    calculator.calculate_psd(data_array)
+    
+    # Create output directory
+    out_dir = Path(file_name).parent / PSD_FOLDER_NAME
+    out_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Save PSD data to file
+    out_file = out_dir / f"{Path(file_name).stem}{PSD_FILE_SUFFIX}"
+    
+    # Save PSD data to file
+    np.savez_compressed(
+        out_file,
+        frequencies=calculator.frequencies,
+        psd=calculator.psd,
+        f_smoothed=calculator.smoothed_frequencies,
+        smoothed_psd=calculator.smoothed_psd,
+        psd_distribution=calculator.psd_distribution,
+        psd_db_range=calculator.PSD_DB_RANGE[:-1],  # Save the bin centers
+        metadata={
+            'filter_enabled': calculator.filter_enabled,
+            'filter_type': calculator.filter_type,
+            'cutoff_freq': calculator.cutoff_freq,
+            'response_removal_enabled': calculator.response_removal_enabled,
+            'window_size': calculator.window_size,
+            'overlap': calculator.overlap,
+            'window_type': calculator.window_type,
+            'psd_freq_min': calculator.psd_freq_min,
+            'psd_freq_max': calculator.psd_freq_max
+        }
+    )
+    return str(out_file)
+
 class PSDProcessingWorker(QObject):
     """Worker for processing files in a separate thread."""
     
@@ -54,10 +155,31 @@ class PSDProcessingWorker(QObject):
         self.psd_freq_max = 100
         self.project_dir = None
         self.instrument_type = 0
-        
-        # Initialize plugin manager
-        self.plugin_manager = PluginManager()
-        self.readers = self.plugin_manager.get_available_readers()
+        self.num_workers = os.cpu_count()  # Files are processed in parallel processes
+        
+    def get_params(self) -> dict:
+        """Get the PSD parameters as a plain dict that can be sent to worker processes.
+        
+        Returns:
+            Parameter dict for _process_one
+        """
+        return {
+            'sensitivity': self.sensitivity,
+            'instrument_type': self.instrument_type,
+            'damping': self.damping,
+            'natural_period': self.natural_period,
+            'filter_enabled': self.filter_enabled,
+            'filter_type': self.filter_type,
+            'filter_freq': self.filter_freq,
+            'low_freq': self.low_freq,
+            'high_freq': self.high_freq,
+            'response_enabled': self.response_enabled,
+            'window_size': self.window_size,
+            'overlap': self.overlap,
+            'window_type': self.window_type,
+            'psd_freq_min': self.psd_freq_min,
+            'psd_freq_max': self.psd_freq_max
+        }
         
     def run(self):
         """Process all files in the list."""
@@ -69,14 +191,23 @@ class PSDProcessingWorker(QObject):
             return
             
         try:
-            for i, filename in enumerate(self.file_list):
-                try:
-                    self.process_file(filename)
-                    progress = int((i + 1) / total_files * 100)
-                    self.progress.emit(progress)
-                except Exception as e:
-                    logger.error(f"Error processing file {filename}: {e}")
+            # Files are independent and CPU bound, so each runs in its own process.
+            # Processes are spawned, not forked: forking this multithreaded Qt
+            # process could copy locks held by other threads into the children
+            params = self.get_params()
+            with ProcessPoolExecutor(max_workers=self.num_workers,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                futures = {executor.submit(_process_one, filename, params): filename
+                           for filename in self.file_list}
+                for done, future in enumerate(as_completed(futures), 1):
+                    filename = futures[future]
+                    try:
+                        out_file = future.result()
+                        logger.info(f"Saved PSD data to {out_file}")
+                    except Exception as e:
+                        logger.error(f"Error processing file {filename}: {e}")
                         # Continue with next file instead of stopping
+                    self.progress.emit(int(done / total_files * 100))
                 
             self.progress.emit(100)
             self.finished.emit()
@@ -90,87 +221,8 @@ class PSDProcessingWorker(QObject):
         logger.info(f"Processing file: {file_name}")
         
         try:
-            # Get file extension and reader
-            ext = Path(file_name).suffix.lower()
-            reader_class = self.readers.get(ext)
-            if not reader_class:
-                raise ValueError(f"Unsupported file format: {ext}")
-                
-            reader = reader_class()
-            data = reader.read(file_name)
-            
-            # Check if data is an ObsPy Stream
-            if hasattr(data, 'traces') and len(data) > 0:
-                # Get the first trace's data
-                trace = data[0]
-                data_array = trace.data
-                sample_rate = trace.stats.sampling_rate
-            else:
-                raise ValueError("Invalid data format: expected ObsPy Stream with at least one trace")
-            
-            # Calculate PSD
-            calculator = PSDCalculator(
-                sample_rate=float(sample_rate),
-                sensitivity=float(self.sensitivity),
-                instrument_type=self.instrument_type,
-                damping_ratio=float(self.damping),
-                natural_period=float(self.natural_period)
-            )
-            
-            # Configure calculator
-            calculator.filter_enabled = self.filter_enabled
-            calculator.response_removal_enabled = self.response_enabled
-            
-            if calculator.filter_enabled:
-                calculator.filter_type = self.filter_type
-                if calculator.filter_type == "High Pass":
-                    calculator.cutoff_freq = self.filter_freq
-                else:  # Band Pass
-                    calculator.cutoff_freq = (self.low_freq, self.high_freq)
-                    
-            # Configure window parameters
-            calculator.window_size = self.window_size
-            calculator.overlap = self.overlap
-            calculator.window_type = self.window_type
-            
-            # Configure PSD frequency range
-            calculator.psd_freq_min = self.psd_freq_min
-            calculator.psd_freq_max = self.psd_freq_max
-            
-            # Calculate PSD and smoothed PSD
-            calculator.calculate_psd(data_array)
-            
-            # Create output directory
-            out_dir = Path(file_name).parent / PSD_FOLDER_NAME
-            out_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Save PSD data to file
-            out_file = out_dir / f"{Path(file_name).stem}{PSD_FILE_SUFFIX}"
-            
-            # Save PSD data to file
-            np.savez(
-                out_file,
-                frequencies=calculator.frequencies,
-                psd=calculator.psd,
-                f_smoothed=calculator.smoothed_frequencies,
-                smoothed_psd=calculator.smoothed_psd,
-                psd_distribution=calculator.psd_distribution,
-                psd_db_range=calculator.PSD_DB_RANGE[:-1],  # Save the bin centers
-                metadata={
-                    'filter_enabled': calculator.filter_enabled,
-                    'filter_type': calculator.filter_type,
-                    'cutoff_freq': calculator.cutoff_freq,
-                    'response_removal_enabled': calculator.response_removal_enabled,
-                    'window_size': calculator.window_size,
-                    'overlap': calculator.overlap,
-                    'window_type': calculator.window_type,
-                    'psd_freq_min': calculator.psd_freq_min,
-                    'psd_freq_max': calculator.psd_freq_max
-                }
-            )
-            
+            out_file = _process_one(file_name, self.get_params())
             logger.info(f"Saved PSD data to {out_file}")
-            
         except Exception as e:
             logger.error(f"Error processing file {file_name}: {e}")
             raise
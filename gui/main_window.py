@@ -826,7 +826,9 @@ class MainWindow(QMainWindow):
         try:
             self.plugin_manager.reload_plugins()
             self.readers = self.plugin_manager.get_available_readers()
-            
+            # Parameters dialogs cache their own plugins and format list
+            ProjectParametersDialog.invalidate_format_cache()
+
             # Update readers menu
             readers_menu = self.findChild(QMenu, "readers_menu")
             if readers_menu:
@@ -0,0 +1,9 @@
+"""
+Test configuration for Tool4S.
+"""
+
+import sys
+from pathlib import Path
+
+# Make the application packages (gui, core, utils, plugins) importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
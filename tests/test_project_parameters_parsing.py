@@ -0,0 +1,63 @@
+"""
+Tests for parsing the response fields of the project parameters dialog.
+"""
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("obspy")
+pytest.importorskip("PyQt5")
+
+from gui.dialogs.project_parameters_dialog import _parse_complex_list, _parse_float_list
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("[(-0.037+0.037j), (-0.037-0.037j)]", [[-0.037, 0.037], [-0.037, -0.037]]),
+    ("[-0.037+0.037j, -0.037-0.037j]", [[-0.037, 0.037], [-0.037, -0.037]]),
+    ("[-5, (-1+2j)]", [[-5.0, 0.0], [-1.0, 2.0]]),
+    ("[0j, -5j, 1e-3]", [[0.0, 0.0], [0.0, -5.0], [0.001, 0.0]]),
+    ("[complex(1, 2), complex(-3)]", [[1.0, 2.0], [-3.0, 0.0]]),
+    ("[ ( 1 + 2j ) ,]", [[1.0, 2.0]]),
+    ("[]", []),
+])
+def test_parse_complex_list(text, expected):
+    assert _parse_complex_list(text) == expected
+
+
+def test_parse_complex_list_round_trips_repr():
+    values = [complex(-0.037, 0.037), 0j, complex(0, -5), complex(1e-5, -2.5e10)]
+    text = f"[{', '.join(map(repr, values))}]"
+    assert _parse_complex_list(text) == [[v.real, v.imag] for v in values]
+
+
+@pytest.mark.parametrize("text", [
+    "[1, a]",
+    "[1,, 2]",
+    "[__import__('os')]",
+    "[(1+2j]",
+])
+def test_parse_complex_list_rejects_invalid_items(text):
+    with pytest.raises(ValueError):
+        _parse_complex_list(text)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("[1, -2.5, 3e-4]", [1.0, -2.5, 0.0003]),
+    ("[ +1 , .5 ,]", [1.0, 0.5]),
+    ("[]", []),
+])
+def test_parse_float_list(text, expected):
+    assert _parse_float_list(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "[1, 2j]",
+    "[1, x, 3]",
+    "[2*3, 4]",
+    "[1.5.2]",
+    "[1-2]",
+    "[1,, 2]",
+])
+def test_parse_float_list_rejects_invalid_items(text):
+    with pytest.raises(ValueError):
+        _parse_float_list(text)